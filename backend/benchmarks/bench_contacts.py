@@ -0,0 +1,95 @@
+"""Micro-benchmark: contact extraction engine vs the previous regex functions.
+
+Builds a corpus of large page texts (the saved profile fixtures plus synthetic
+company pages padded with digit-heavy noise) and times extracting emails and
+phone numbers from each one:
+
+    python benchmarks/bench_contacts.py --pages 20 --repeat 5
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+import server  # noqa: E402
+
+FIXTURES_DIR = BACKEND_DIR.parent / 'tests' / 'fixtures' / 'startup_india'
+
+
+def legacy_extract_emails(text: str) -> List[str]:
+    """Email extraction as implemented before the contact extractor"""
+    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+    return list(set(re.findall(email_pattern, text)))
+
+
+def legacy_extract_phone_numbers(text: str) -> List[str]:
+    """Phone extraction as implemented before the contact extractor"""
+    patterns = [
+        r'\+91[\s-]?\d{10}',
+        r'\d{10}',
+        r'\(\d{3}\)[\s-]?\d{3}[\s-]?\d{4}',
+        r'\d{3}[\s-]\d{3}[\s-]\d{4}'
+    ]
+    phones = []
+    for pattern in patterns:
+        phones.extend(re.findall(pattern, text))
+    return list(set(phones))
+
+
+def synthetic_page(rng: random.Random, paragraphs: int) -> str:
+    """A large company page: prose, order ids, prices, dates and a few contacts"""
+    words = ['robotics', 'platform', 'customers', 'India', 'scale', 'logistics', 'cloud', 'team', 'growth']
+    parts = []
+    for index in range(paragraphs):
+        sentence = ' '.join(rng.choice(words) for _ in range(40))
+        noise = f"Order #{rng.randrange(10**13, 10**14)} on 2024-{index % 12 + 1:02d}-15 for Rs {rng.randrange(1000, 99999)}."
+        parts.append(f"<p>{sentence}. {noise}</p>")
+        if index % 25 == 0:
+            parts.append(f"<p>Write to sales{index}@example.co.in or call +91 98{rng.randrange(10**7, 10**8)}.</p>")
+    return '<html><body>' + '\n'.join(parts) + '<footer>Call 080-234-56789 or (080) 234-5678</footer></body></html>'
+
+
+def build_corpus(pages: int, paragraphs: int) -> List[str]:
+    rng = random.Random(42)
+    html_pages = [path.read_bytes() for path in sorted(FIXTURES_DIR.glob('*.html'))]
+    html_pages += [synthetic_page(rng, paragraphs).encode() for _ in range(pages)]
+    return [server.make_soup(page).get_text() for page in html_pages]
+
+
+def best_of(repeat: int, func, corpus: List[str]) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in corpus:
+            func(text)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, default=20, help='number of synthetic pages')
+    parser.add_argument('--paragraphs', type=int, default=500, help='paragraphs per synthetic page')
+    parser.add_argument('--repeat', type=int, default=5, help='timing runs; the best is reported')
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.pages, args.paragraphs)
+    megabytes = sum(len(text) for text in corpus) / 1e6
+    print(f"Corpus: {len(corpus)} pages, {megabytes:.1f} MB of text")
+
+    legacy = best_of(args.repeat, lambda text: (legacy_extract_emails(text), legacy_extract_phone_numbers(text)), corpus)
+    engine = best_of(args.repeat, server.extract_contacts, corpus)
+
+    print(f"{'legacy extract_emails + extract_phone_numbers':<48} {legacy * 1000:9.1f} ms  {megabytes / legacy:7.1f} MB/s")
+    print(f"{'extract_contacts':<48} {engine * 1000:9.1f} ms  {megabytes / engine:7.1f} MB/s")
+    print(f"Speedup: {legacy / engine:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,375 @@
+"""End-to-end scrape benchmark against a local fixture HTTP server.
+
+Starts benchmarks/fixture_server.py in a subprocess and drives scrape_url, the
+bulk scrape endpoint, background jobs and the exports against a local Mongo
+(--mongo-url; the --db-name database is dropped first) or an in-memory
+mongomock stand-in. Reports URLs/sec, p50/p95/p99 latency, peak RSS and
+database operations per URL, and saves them as JSON for comparing commits:
+
+    python benchmarks/bench_scrape.py --urls 500 --concurrency 32 --latency-ms 50
+    python benchmarks/bench_scrape.py --mongo-url mongodb://localhost:27017 --compare results/baseline.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import resource
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'scraper_bench')
+
+import httpx  # noqa: E402
+from motor.motor_asyncio import AsyncIOMotorClient  # noqa: E402
+from pymongo import monitoring  # noqa: E402
+
+import server  # noqa: E402
+
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+COMPARED_METRICS = ['urls_per_sec', 'latency_ms.p50', 'latency_ms.p95', 'latency_ms.p99', 'db_ops_per_url', 'peak_rss_mb']
+
+
+class CommandCounter(monitoring.CommandListener):
+    """Counts database commands sent by a real Mongo client"""
+
+    IGNORED = frozenset(['hello', 'ismaster', 'isMaster', 'ping', 'endSessions'])
+
+    def __init__(self):
+        self.count = 0
+
+    def started(self, event):
+        if event.command_name not in self.IGNORED:
+            self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+class CountingCollection:
+    """Counts collection method calls for the in-memory stand-in, which sends no commands"""
+
+    METHODS = frozenset([
+        'find', 'find_one', 'find_one_and_update', 'insert_one', 'insert_many', 'update_one',
+        'update_many', 'bulk_write', 'count_documents', 'delete_many', 'aggregate', 'create_index',
+    ])
+
+    def __init__(self, collection, counter: CommandCounter):
+        self._collection = collection
+        self._counter = counter
+
+    def __getattr__(self, name):
+        attr = getattr(self._collection, name)
+        if name not in self.METHODS:
+            return attr
+
+        def counted(*args, **kwargs):
+            self._counter.count += 1
+            return attr(*args, **kwargs)
+        return counted
+
+
+class CountingDatabase:
+    def __init__(self, database, counter: CommandCounter):
+        self._database = database
+        self._counter = counter
+
+    def __getattr__(self, name):
+        return CountingCollection(getattr(self._database, name), self._counter)
+
+    def __getitem__(self, name):
+        return CountingCollection(self._database[name], self._counter)
+
+
+async def connect_database(args) -> CommandCounter:
+    """Point server at the benchmark database and return its operation counter"""
+    counter = CommandCounter()
+    if args.mongo_url:
+        server.client = AsyncIOMotorClient(args.mongo_url, tz_aware=True, event_listeners=[counter])
+        await server.client.drop_database(args.db_name)
+        server.db = server.client[args.db_name]
+    else:
+        try:
+            from mongomock_motor import AsyncMongoMockClient
+        except ImportError:
+            sys.exit("Install mongomock-motor for the in-memory database, or pass --mongo-url")
+        server.client = AsyncMongoMockClient()
+        server.db = CountingDatabase(server.client[args.db_name], counter)
+    return counter
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def start_fixture_server(args) -> subprocess.Popen:
+    process = subprocess.Popen([
+        sys.executable, str(Path(__file__).resolve().parent / 'fixture_server.py'),
+        '--port', str(args.port), '--latency-ms', str(args.latency_ms),
+        '--error-rate', str(args.error_rate), '--page-kb', str(args.page_kb),
+    ])
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            _, writer = await asyncio.open_connection('127.0.0.1', args.port)
+            writer.close()
+            return process
+        except OSError:
+            await asyncio.sleep(0.1)
+    process.terminate()
+    sys.exit("Fixture server did not start")
+
+
+def latency_summary(latencies: List[float]) -> Optional[Dict[str, float]]:
+    if not latencies:
+        return None
+    if len(latencies) == 1:
+        p50 = p95 = p99 = latencies[0]
+    else:
+        cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    return {
+        'p50': round(p50 * 1000, 2),
+        'p95': round(p95 * 1000, 2),
+        'p99': round(p99 * 1000, 2),
+        'max': round(max(latencies) * 1000, 2),
+    }
+
+
+def peak_rss_mb() -> Dict[str, float]:
+    """Peak resident set size of this process and of its (parser pool) children"""
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024  # bytes on macOS, KiB on Linux
+    return {'peak_rss_mb': round(own / scale, 1), 'children_peak_rss_mb': round(children / scale, 1)}
+
+
+def report(urls: int, seconds: float, latencies: List[float], failed: int, db_ops: int) -> Dict[str, Any]:
+    return {
+        'urls': urls,
+        'seconds': round(seconds, 3),
+        'urls_per_sec': round(urls / seconds, 2) if seconds else None,
+        'latency_ms': latency_summary(latencies),
+        'failed': failed,
+        'db_ops': db_ops,
+        'db_ops_per_url': round(db_ops / urls, 2) if urls else None,
+        **peak_rss_mb(),
+    }
+
+
+class Bench:
+    def __init__(self, args, counter: CommandCounter):
+        self.args = args
+        self.counter = counter
+        self.next_profile = 0
+
+    def profile_urls(self, count: int) -> List[str]:
+        """Fresh profile URLs, so no scenario is served from another's results"""
+        start = self.next_profile
+        self.next_profile += count
+        return [f"http://127.0.0.1:{self.args.port}/profile/{n}" for n in range(start, start + count)]
+
+    def api(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app), base_url='http://bench/api', timeout=None)
+
+    async def scrape_url(self) -> Dict[str, Any]:
+        urls = iter(self.profile_urls(self.args.urls))
+        latencies, failed = [], 0
+        ops_before = self.counter.count
+
+        async def worker():
+            nonlocal failed
+            for url in urls:
+                started = time.perf_counter()
+                result = await server.scrape_url(url)
+                latencies.append(time.perf_counter() - started)
+                failed += result.status == 'failed'
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(self.args.concurrency)))
+        await server.result_writer.flush()
+        return report(self.args.urls, time.perf_counter() - started, latencies, failed, self.counter.count - ops_before)
+
+    async def bulk(self) -> Dict[str, Any]:
+        urls = self.profile_urls(self.args.urls)
+        batches = iter([urls[i:i + self.args.bulk_size] for i in range(0, len(urls), self.args.bulk_size)])
+        latencies, failed = [], 0
+        ops_before = self.counter.count
+
+        async def client_loop(api: httpx.AsyncClient):
+            nonlocal failed
+            for batch in batches:
+                started = time.perf_counter()
+                response = await api.post('/scrape/bulk', json={'urls': batch})
+                latencies.append(time.perf_counter() - started)
+                response.raise_for_status()
+                failed += sum(result['status'] == 'failed' for result in response.json())
+
+        started = time.perf_counter()
+        async with self.api() as api:
+            await asyncio.gather(*(client_loop(api) for _ in range(self.args.bulk_clients)))
+        return report(len(urls), time.perf_counter() - started, latencies, failed, self.counter.count - ops_before)
+
+    async def job(self) -> Dict[str, Any]:
+        urls = self.profile_urls(self.args.urls)
+        ops_before = self.counter.count
+        started = time.perf_counter()
+        workers = server.start_job_workers(self.args.concurrency)
+        try:
+            async with self.api() as api:
+                response = await api.post('/jobs', json={'urls': urls})
+                response.raise_for_status()
+                job_id = response.json()['id']
+                while True:
+                    await asyncio.sleep(0.05)
+                    job = (await api.get(f'/jobs/{job_id}')).json()
+                    if job['status'] in ('completed', 'cancelled'):
+                        break
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        await asyncio.gather(*server.job_completions, return_exceptions=True)
+        return report(len(urls), time.perf_counter() - started, [], job['failed'], self.counter.count - ops_before)
+
+    async def export(self, fmt: str) -> Dict[str, Any]:
+        rows = await server.db.scraped_data.count_documents({})
+        ops_before = self.counter.count
+        size = 0
+        started = time.perf_counter()
+        async with self.api() as api:
+            async with api.stream('GET', f'/export/{fmt}') as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_raw():
+                    size += len(chunk)
+        seconds = time.perf_counter() - started
+        result = report(rows, seconds, [seconds], 0, self.counter.count - ops_before)
+        result['bytes'] = size
+        return result
+
+
+def lookup(metrics: Dict[str, Any], dotted: str) -> Optional[float]:
+    for part in dotted.split('.'):
+        if not isinstance(metrics, dict):
+            return None
+        metrics = metrics.get(part)
+    return metrics
+
+
+def print_results(results: Dict[str, Any], baseline: Optional[Dict[str, Any]]):
+    for name, metrics in results['scenarios'].items():
+        print(f"\n{name}")
+        old = (baseline or {}).get('scenarios', {}).get(name, {})
+        for metric in COMPARED_METRICS:
+            value = lookup(metrics, metric)
+            if value is None:
+                continue
+            line = f"  {metric:<16} {value:>10}"
+            previous = lookup(old, metric)
+            if previous:
+                line += f"   baseline {previous:>10}  ({(value - previous) / previous:+.1%})"
+            print(line)
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args) -> Dict[str, Any]:
+    counter = await connect_database(args)
+    fixture_server = await start_fixture_server(args)
+    server.PARSE_WORKERS = args.parse_workers
+    server.scrape_scheduler = server.ScrapeScheduler(args.concurrency, args.per_host_concurrency, args.per_host_delay)
+    server.get_http_session()
+    server.start_parse_pool()
+    await server.ensure_indexes()
+    writer = asyncio.create_task(server.result_writer.run())
+
+    bench = Bench(args, counter)
+    scenarios = {}
+    try:
+        for name in args.scenarios:
+            if name == 'export':
+                for fmt in ('csv', 'ndjson', 'parquet'):
+                    scenarios[f'export_{fmt}'] = await bench.export(fmt)
+            else:
+                scenarios[name] = await getattr(bench, name)()
+            print(f"{name} done", file=sys.stderr)
+    finally:
+        writer.cancel()
+        await asyncio.gather(writer, return_exceptions=True)
+        await server.result_writer.close()
+        await server.http_session.close()
+        server.stop_parse_pool()
+        fixture_server.terminate()
+        fixture_server.wait()
+
+    return {
+        'commit': git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'database': 'mongo' if args.mongo_url else 'memory',
+        'config': {key: value for key, value in vars(args).items() if key not in ('output', 'compare')},
+        'scenarios': scenarios,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--urls', type=int, default=200, help='URLs per scrape scenario')
+    parser.add_argument('--concurrency', type=int, default=server.SCRAPE_CONCURRENCY)
+    parser.add_argument('--per-host-concurrency', type=int, default=None,
+                        help='defaults to --concurrency, since every URL is on the fixture host')
+    parser.add_argument('--per-host-delay', type=float, default=0.0)
+    parser.add_argument('--parse-workers', type=int, default=server.PARSE_WORKERS)
+    parser.add_argument('--bulk-size', type=int, default=50, help='URLs per /scrape/bulk request')
+    parser.add_argument('--bulk-clients', type=int, default=2, help='concurrent /scrape/bulk requests')
+    parser.add_argument('--latency-ms', type=float, default=20.0, help='fixture server response delay')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of fixture responses that are 503')
+    parser.add_argument('--page-kb', type=int, default=0, help='filler added to every fixture page')
+    parser.add_argument('--scenarios', nargs='+', default=['scrape_url', 'bulk', 'job', 'export'],
+                        choices=['scrape_url', 'bulk', 'job', 'export'])
+    parser.add_argument('--mongo-url', help='benchmark against this Mongo instead of the in-memory stand-in')
+    parser.add_argument('--db-name', default='scraper_bench')
+    parser.add_argument('--port', type=int, default=None, help='fixture server port (default: a free port)')
+    parser.add_argument('--output', type=Path, help='JSON results file (default: benchmarks/results/)')
+    parser.add_argument('--compare', type=Path, help='earlier JSON results to compare against')
+    parser.add_argument('--verbose', action='store_true', help='keep the server INFO logs')
+    args = parser.parse_args()
+    args.port = args.port or free_port()
+    args.per_host_concurrency = args.per_host_concurrency or args.concurrency
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+
+    results = asyncio.run(run(args))
+
+    output = args.output
+    if output is None:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')
+        output = RESULTS_DIR / f"scrape-{results['commit'] or 'unknown'}-{stamp}.json"
+    output.write_text(json.dumps(results, indent=2, default=str))
+
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    print_results(results, baseline)
+    print(f"\nResults saved to {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""Local stand-in for the Startup India portal and company websites.
+
+Serves the recorded profile pages from tests/fixtures/startup_india with
+their website links pointed back at this server, plus synthetic company
+sites, with configurable latency, error rate and page size:
+
+    python benchmarks/fixture_server.py --port 8901 --latency-ms 50 --error-rate 0.02 --page-kb 200
+
+    GET /profile/{n}   profile page n (fixtures are used round-robin)
+    GET /site/{n}      company website linked from profile n
+"""
+import argparse
+import asyncio
+import json
+import random
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from aiohttp import web
+
+FIXTURES_DIR = Path(__file__).resolve().parent.parent.parent / 'tests' / 'fixtures' / 'startup_india'
+
+SITE_TEMPLATE = """<html><head><title>Company {n}</title></head><body>
+<nav><a href="/">Home</a> <a href="/about">About</a> <a href="/contact">Contact</a></nav>
+<section class="about">Company {n} builds software for farms, fleets and factories across India.</section>
+{padding}
+<footer class="footer">Write to hello@company{n}.in or call +91 98{n:08d}. Bengaluru, Karnataka</footer>
+</body></html>"""
+
+
+def padding(kb: int, rng: random.Random) -> str:
+    """Filler paragraphs adding roughly ``kb`` kilobytes to a page"""
+    words = ['robotics', 'platform', 'customers', 'India', 'scale', 'logistics', 'cloud', 'team', 'growth']
+    parts, size = [], 0
+    while size < kb * 1024:
+        paragraph = f"<p>{' '.join(rng.choice(words) for _ in range(60))}. Order #{rng.randrange(10**13, 10**14)}.</p>"
+        parts.append(paragraph)
+        size += len(paragraph)
+    return '\n'.join(parts)
+
+
+def load_profiles() -> List[Tuple[str, Optional[str]]]:
+    """Each recorded profile page with the website it links to, from its golden JSON"""
+    profiles = []
+    for path in sorted(FIXTURES_DIR.glob('*.html')):
+        expected = json.loads(path.with_suffix('.json').read_text(encoding='utf-8'))
+        profiles.append((path.read_text(encoding='utf-8'), expected.get('website')))
+    return profiles
+
+
+def make_app(latency_ms: float = 0.0, error_rate: float = 0.0, page_kb: int = 0, seed: int = 42) -> web.Application:
+    profiles = load_profiles()
+    rng = random.Random(seed)
+    filler = padding(page_kb, rng) if page_kb else ''
+
+    async def delay_or_fail():
+        if latency_ms:
+            # +/-50% jitter around the configured latency
+            await asyncio.sleep(latency_ms * rng.uniform(0.5, 1.5) / 1000)
+        if error_rate and rng.random() < error_rate:
+            raise web.HTTPServiceUnavailable()
+
+    async def profile(request: web.Request) -> web.Response:
+        await delay_or_fail()
+        n = int(request.match_info['n'])
+        html, website = profiles[n % len(profiles)]
+        if website:
+            html = html.replace(website, f"http://{request.host}/site/{n}")
+        html = html.replace('</body>', filler + '</body>', 1)
+        return web.Response(text=html, content_type='text/html')
+
+    async def site(request: web.Request) -> web.Response:
+        await delay_or_fail()
+        n = int(request.match_info['n'])
+        return web.Response(text=SITE_TEMPLATE.format(n=n, padding=filler), content_type='text/html')
+
+    app = web.Application()
+    app.router.add_get('/profile/{n}', profile)
+    app.router.add_get('/site/{n}', site)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8901)
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='mean response delay, jittered +/-50%%')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests answered with 503')
+    parser.add_argument('--page-kb', type=int, default=0, help='filler added to every page')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    app = make_app(args.latency_ms, args.error_rate, args.page_kb, args.seed)
+    web.run_app(app, host=args.host, port=args.port, access_log=None, print=None)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+"""Offline re-extraction over archived pages.
+
+Re-runs the current parsers over the raw HTML archived for each scraped record
+and updates the fields that changed, without fetching anything, so parser
+fixes can be applied to existing results. Needs HTML_ARCHIVE_BACKEND set to
+the backend the pages were archived with:
+
+    python reextract.py --dry-run          # report how many records would change
+    python reextract.py --workers 8        # decompress and parse on 8 processes
+"""
+import argparse
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import UpdateOne
+
+import server
+from server import logger
+
+
+def reextract_record(
+    startup_blob: bytes,
+    startup_encoding: Optional[str],
+    website_pages: List[Tuple[bytes, Optional[str]]],
+) -> Dict[str, Any]:
+    """Decompress and parse one record's archived pages into its extracted fields"""
+    startup_data = server.parse_startup_india_page(server.HTMLArchive.decompress(startup_blob), startup_encoding)
+    website_data = []
+    if startup_data.get('website'):
+        website_data = [
+            server.parse_website_details(server.HTMLArchive.decompress(blob), encoding)
+            for blob, encoding in website_pages
+        ]
+    merged = server.merge_extractions(startup_data, *website_data)
+    return {field: merged.get(field) for field in server.EXTRACTED_FIELDS}
+
+
+def website_page_refs(archive: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """The landing page and then the crawled pages, in the order they were merged"""
+    crawled = sorted(
+        (key for key in archive if key.startswith('website_')),
+        key=lambda key: int(key.split('_', 1)[1]),
+    )
+    return [archive[key] for key in ['website', *crawled] if key in archive]
+
+
+async def load_page(ref: Optional[Dict[str, Any]]) -> Optional[bytes]:
+    if not ref:
+        return None
+    try:
+        return await server.html_archive.get(ref['sha256'])
+    except Exception as e:
+        logger.error(f"Archived page {ref['sha256']} for {ref.get('url')} is unavailable: {e}")
+        return None
+
+
+async def reextract_batch(pool: ProcessPoolExecutor, records, dry_run: bool) -> int:
+    """Re-extract a batch of records and write back the changed fields; returns how many changed.
+
+    Changed records also get their new fingerprint, on the record and on the
+    refresh target pointing at it, so the next refresh sees them as unchanged.
+    """
+    loop = asyncio.get_running_loop()
+    target_updates = []
+
+    async def reextract(record):
+        archive = record['html_archive']
+        website_refs = website_page_refs(archive)
+        startup_blob, *website_blobs = await asyncio.gather(
+            load_page(archive.get('startup')), *(load_page(ref) for ref in website_refs)
+        )
+        if startup_blob is None:
+            return None
+        website_pages = [
+            (blob, ref.get('encoding')) for blob, ref in zip(website_blobs, website_refs) if blob is not None
+        ]
+        try:
+            fields = await loop.run_in_executor(
+                pool, reextract_record, startup_blob, archive['startup'].get('encoding'), website_pages,
+            )
+        except Exception as e:
+            logger.error(f"Error re-extracting {record['id']}: {e}")
+            return None
+        changed = {key: value for key, value in fields.items() if record.get(key) != value}
+        fingerprint = server.extraction_fingerprint(fields)
+        if record.get('fingerprint') is not None and record['fingerprint'] != fingerprint:
+            changed['fingerprint'] = fingerprint
+        if not changed:
+            return None
+        if 'fingerprint' in changed:
+            target_updates.append(UpdateOne({"result_id": record['id']}, {"$set": {"fingerprint": fingerprint}}))
+        return UpdateOne({"id": record['id']}, {"$set": changed})
+
+    updates = [update for update in await asyncio.gather(*(reextract(r) for r in records)) if update is not None]
+    if updates and not dry_run:
+        await server.db.scraped_data.bulk_write(updates, ordered=False)
+        if target_updates:
+            await server.db.scrape_targets.bulk_write(target_updates, ordered=False)
+    return len(updates)
+
+
+async def main(workers: int, batch_size: int, limit: int, dry_run: bool):
+    if server.html_archive is None:
+        raise SystemExit("HTML_ARCHIVE_BACKEND is 'none'; set it to the backend pages were archived with")
+
+    query = {"html_archive.startup": {"$exists": True}, "status": {"$ne": "failed"}}
+    projection = {"_id": 0, "id": 1, "html_archive": 1, "fingerprint": 1, **{field: 1 for field in server.EXTRACTED_FIELDS}}
+    cursor = server.db.scraped_data.find(query, projection).batch_size(batch_size)
+    if limit:
+        cursor = cursor.limit(limit)
+
+    pool = server.spawn_process_pool(workers)
+    seen = changed = 0
+    batch = []
+    try:
+        async for record in cursor:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                changed += await reextract_batch(pool, batch, dry_run)
+                seen += len(batch)
+                batch = []
+                logger.info(f"Re-extracted {seen} records, {changed} changed")
+        if batch:
+            changed += await reextract_batch(pool, batch, dry_run)
+            seen += len(batch)
+    finally:
+        pool.shutdown(cancel_futures=True)
+        server.client.close()
+    verb = "would change" if dry_run else "changed"
+    logger.info(f"Re-extracted {seen} records, {changed} {verb}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-run the parsers over archived pages")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="processes decompressing and parsing pages")
+    parser.add_argument("--batch-size", type=int, default=200,
+                        help="records re-extracted and written per round")
+    parser.add_argument("--limit", type=int, default=0, help="stop after this many records (0 = all)")
+    parser.add_argument("--dry-run", action="store_true", help="count changes without writing them")
+    args = parser.parse_args()
+    asyncio.run(main(args.workers, args.batch_size, args.limit, args.dry_run))
@@ -1,30 +1,60 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, UploadFile, File, Header
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Header, Response, Request
 from fastapi.responses import StreamingResponse
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorGridFSBucket
+from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
 import os
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field, ConfigDict, HttpUrl
-from typing import List, Optional, Dict, Any
+from python_multipart import create_form_parser
+from python_multipart.exceptions import FormParserError
+from python_multipart.multipart import File as MultipartFile
+from typing import List, Optional, Dict, Any, Tuple, NamedTuple, Callable, AsyncIterator
 import uuid
-from datetime import datetime, timezone
-import requests
-from bs4 import BeautifulSoup
+from datetime import datetime, timezone, timedelta
+import aiohttp
+import zstandard
+import pyarrow as pa
+import pyarrow.parquet as pq
+from bs4 import BeautifulSoup, FeatureNotFound
 import re
 import asyncio
 import csv
 import io
 import json
+import math
+import random
+import base64
+import codecs
+import hashlib
 import secrets
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+import socket
+import threading
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse, urlsplit, urlunsplit, parse_qsl, urlencode, urljoin, urldefrag
+from urllib.robotparser import RobotFileParser
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(mongo_url, tz_aware=True)
 db = client[os.environ['DB_NAME']]
 
 # Create the main app without a prefix
@@ -33,6 +63,110 @@ app = FastAPI()
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
 
+# Scraping concurrency settings
+SCRAPE_CONCURRENCY = int(os.environ.get('SCRAPE_CONCURRENCY', '16'))
+SCRAPE_PER_HOST_CONCURRENCY = int(os.environ.get('SCRAPE_PER_HOST_CONCURRENCY', '2'))
+SCRAPE_PER_HOST_DELAY = float(os.environ.get('SCRAPE_PER_HOST_DELAY', '1.0'))
+
+# Export settings
+EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', '500'))
+ARROW_BATCH_SIZE = int(os.environ.get('ARROW_BATCH_SIZE', '10000'))  # Rows per record batch / row group
+
+# Result freshness settings
+SCRAPE_FRESHNESS_SECONDS = int(os.environ.get('SCRAPE_FRESHNESS_SECONDS', '3600'))  # 0 = always scrape
+SCRAPE_RECENT_RESULTS = int(os.environ.get('SCRAPE_RECENT_RESULTS', '10000'))
+
+# Incremental refresh settings
+#
+# Every scraped URL becomes a refresh target that is re-queued on its own
+# interval: halved when a check finds changed content, grown when it does not.
+# Failed checks back off exponentially from REFRESH_MIN_INTERVAL instead.
+REFRESH_POLL_INTERVAL = float(os.environ.get('REFRESH_POLL_INTERVAL', '60'))  # 0 = don't queue refreshes from this process
+REFRESH_BATCH_SIZE = int(os.environ.get('REFRESH_BATCH_SIZE', '500'))  # Most targets queued per job
+REFRESH_INITIAL_INTERVAL = float(os.environ.get('REFRESH_INITIAL_INTERVAL', str(24 * 3600)))
+REFRESH_MIN_INTERVAL = float(os.environ.get('REFRESH_MIN_INTERVAL', str(6 * 3600)))
+REFRESH_MAX_INTERVAL = float(os.environ.get('REFRESH_MAX_INTERVAL', str(30 * 24 * 3600)))
+REFRESH_INTERVAL_GROWTH = float(os.environ.get('REFRESH_INTERVAL_GROWTH', '1.5'))  # Applied after an unchanged check
+REFRESH_REQUEUE_AFTER = float(os.environ.get('REFRESH_REQUEUE_AFTER', str(6 * 3600)))  # Queued targets not checked by then are queued again
+REFRESH_MAX_FAILURES = int(os.environ.get('REFRESH_MAX_FAILURES', '5'))  # Failed checks in a row before a target is parked (0 = never)
+
+# Result write settings
+RESULT_WRITE_BATCH_SIZE = int(os.environ.get('RESULT_WRITE_BATCH_SIZE', '200'))
+RESULT_WRITE_INTERVAL = float(os.environ.get('RESULT_WRITE_INTERVAL', '1.0'))  # Max seconds a result waits in the buffer
+
+# CSV upload settings
+CSV_URL_COLUMNS = [c.strip().lower() for c in os.environ.get('CSV_URL_COLUMNS', 'url,link,website,source_url,href').split(',') if c.strip()]
+
+# Background job settings
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', str(SCRAPE_CONCURRENCY)))  # 0 = API-only replica
+JOB_ITEM_BATCH_SIZE = int(os.environ.get('JOB_ITEM_BATCH_SIZE', '1000'))
+JOB_LEASE_SECONDS = float(os.environ.get('JOB_LEASE_SECONDS', '60'))
+JOB_HEARTBEAT_SECONDS = float(os.environ.get('JOB_HEARTBEAT_SECONDS', str(JOB_LEASE_SECONDS / 3)))
+JOB_POLL_INTERVAL = float(os.environ.get('JOB_POLL_INTERVAL', '1.0'))
+JOB_EVENT_BATCH_SIZE = int(os.environ.get('JOB_EVENT_BATCH_SIZE', '100'))
+JOB_EVENT_GAP_TIMEOUT = float(os.environ.get('JOB_EVENT_GAP_TIMEOUT', '10'))  # Seconds before a missing event is skipped
+JOB_EVENT_KEEPALIVE = float(os.environ.get('JOB_EVENT_KEEPALIVE', '15'))
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+# API key settings
+API_KEY_CACHE_TTL = float(os.environ.get('API_KEY_CACHE_TTL', '60'))  # Max seconds a validated key is trusted without a lookup
+API_KEY_CACHE_SIZE = int(os.environ.get('API_KEY_CACHE_SIZE', '10000'))
+API_KEY_REVOCATION_POLL = float(os.environ.get('API_KEY_REVOCATION_POLL', '5'))
+API_KEY_USAGE_FLUSH_INTERVAL = float(os.environ.get('API_KEY_USAGE_FLUSH_INTERVAL', '10'))
+
+# Rate limit settings (token bucket per API key; keys may override rate and burst)
+RATE_LIMIT_RATE = float(os.environ.get('RATE_LIMIT_RATE', '2'))  # Tokens (URLs) per second
+RATE_LIMIT_BURST = int(os.environ.get('RATE_LIMIT_BURST', '20'))
+RATE_LIMIT_BACKEND = os.environ.get('RATE_LIMIT_BACKEND', 'memory')  # memory, mongo (shared by replicas)
+
+# HTTP client settings
+HTTP_POOL_SIZE = int(os.environ.get('HTTP_POOL_SIZE', '100'))
+HTTP_POOL_PER_HOST = int(os.environ.get('HTTP_POOL_PER_HOST', '10'))
+HTTP_DNS_CACHE_TTL = int(os.environ.get('HTTP_DNS_CACHE_TTL', '300'))
+HTTP_KEEPALIVE_TIMEOUT = float(os.environ.get('HTTP_KEEPALIVE_TIMEOUT', '30'))
+HTTP_CONNECT_TIMEOUT = float(os.environ.get('HTTP_CONNECT_TIMEOUT', '5'))
+HTTP_READ_TIMEOUT = float(os.environ.get('HTTP_READ_TIMEOUT', '15'))
+HTTP_TOTAL_TIMEOUT = float(os.environ.get('HTTP_TOTAL_TIMEOUT', '30'))
+HTTP_CACHE_MAX_BYTES = int(os.environ.get('HTTP_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+FETCH_MAX_BYTES = int(os.environ.get('FETCH_MAX_BYTES', str(5 * 1024 * 1024)))  # Longer bodies are cut off here
+FETCH_CHUNK_SIZE = int(os.environ.get('FETCH_CHUNK_SIZE', str(64 * 1024)))
+
+# Fetch retry and circuit breaker settings
+FETCH_RETRIES = int(os.environ.get('FETCH_RETRIES', '3'))  # Extra attempts after a transient failure
+FETCH_BACKOFF_BASE = float(os.environ.get('FETCH_BACKOFF_BASE', '0.5'))
+FETCH_BACKOFF_MAX = float(os.environ.get('FETCH_BACKOFF_MAX', '30'))
+FETCH_RETRY_AFTER_MAX = float(os.environ.get('FETCH_RETRY_AFTER_MAX', '60'))  # Longer Retry-After values fail the fetch
+BREAKER_FAILURE_THRESHOLD = int(os.environ.get('BREAKER_FAILURE_THRESHOLD', '5'))  # Consecutive failures that open a host's breaker
+BREAKER_RESET_SECONDS = float(os.environ.get('BREAKER_RESET_SECONDS', '30'))
+SCRAPE_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+# HTML parsing settings
+HTML_PARSER = os.environ.get('HTML_PARSER', 'lxml')  # lxml, html.parser, html5lib
+PARSE_WORKERS = int(os.environ.get('PARSE_WORKERS', str(os.cpu_count() or 1)))  # 0 = parse in-process
+
+# Website crawl settings
+CRAWL_MAX_DEPTH = int(os.environ.get('CRAWL_MAX_DEPTH', '1'))  # Link hops from a company's landing page; 0 = landing page only
+CRAWL_MAX_PAGES = int(os.environ.get('CRAWL_MAX_PAGES', '3'))  # Pages fetched per site besides the landing page
+CRAWL_CONCURRENCY = int(os.environ.get('CRAWL_CONCURRENCY', '3'))  # Pages of one site fetched at once
+ROBOTS_CACHE_TTL = float(os.environ.get('ROBOTS_CACHE_TTL', '3600'))
+ROBOTS_CACHE_SIZE = int(os.environ.get('ROBOTS_CACHE_SIZE', '1000'))
+ROBOTS_MAX_BYTES = int(os.environ.get('ROBOTS_MAX_BYTES', str(512 * 1024)))
+
+# Raw HTML archive settings
+#
+# Off by default. gridfs keeps pages in Mongo where every replica and the
+# re-extract tool can read them; local writes to HTML_ARCHIVE_DIR on this host
+# only, so it suits single-host deployments. Neither prunes old pages.
+HTML_ARCHIVE_BACKEND = os.environ.get('HTML_ARCHIVE_BACKEND', 'none')  # none, gridfs, local
+HTML_ARCHIVE_DIR = Path(os.environ.get('HTML_ARCHIVE_DIR', str(ROOT_DIR / 'html_archive')))
+HTML_ARCHIVE_ZSTD_LEVEL = int(os.environ.get('HTML_ARCHIVE_ZSTD_LEVEL', '10'))
+
+# Metrics settings
+METRICS_MAX_HOSTS = int(os.environ.get('METRICS_MAX_HOSTS', '50'))  # Hosts beyond this are labelled "other"
+METRICS_QUEUE_INTERVAL = float(os.environ.get('METRICS_QUEUE_INTERVAL', '15'))
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -40,12 +174,53 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Metrics
+STAGE_SECONDS = Histogram(
+    'scraper_stage_duration_seconds', 'Time spent in each stage of a scrape',
+    ['stage', 'host', 'outcome'],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+HTTP_PHASE_SECONDS = Histogram(
+    'scraper_http_phase_duration_seconds', 'DNS lookup, connection setup (TCP and TLS) and time to response headers',
+    ['phase', 'host'],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+SCRAPE_SECONDS = Histogram(
+    'scraper_scrape_duration_seconds', 'Time to scrape a URL end to end', ['outcome'],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+SCRAPES_TOTAL = Counter('scraper_scrapes_total', 'scrape_url calls by how they were served', ['outcome'])
+RESPONSE_CACHE_TOTAL = Counter('scraper_response_cache_total', 'Page cache lookups', ['result'])
+FLUSH_SECONDS = Histogram(
+    'scraper_result_flush_duration_seconds', 'Time to write one batch of results',
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+FLUSH_BATCH_SIZE = Histogram(
+    'scraper_result_flush_batch_size', 'Results written per batch',
+    buckets=(1, 2, 5, 10, 25, 50, 100, 200, 500, 1000),
+)
+
+_metric_hosts: set = set()
+
+def metric_host(host: str) -> str:
+    """Host label value, capped at METRICS_MAX_HOSTS distinct hosts"""
+    if host in _metric_hosts:
+        return host
+    if len(_metric_hosts) < METRICS_MAX_HOSTS:
+        _metric_hosts.add(host)
+        return host
+    return 'other'
+
+def observe_stage(stage: str, url: str, outcome: str, started: float):
+    STAGE_SECONDS.labels(stage, metric_host(url_host(url)), outcome).observe(time.perf_counter() - started)
+
 # Define Models
 class ScrapedData(BaseModel):
     model_config = ConfigDict(extra="ignore")
     
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     source_url: str
+    normalized_url: Optional[str] = None
     domain: Optional[str] = None
     website: Optional[str] = None
     email: Optional[str] = None
@@ -64,11 +239,36 @@ class ScrapedData(BaseModel):
     status: str = "success"  # success, failed, partial
     error_message: Optional[str] = None
     timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    html_archive: Optional[Dict[str, Dict[str, Any]]] = None  # "startup"/"website" -> archived page reference
+    fingerprint: Optional[str] = None  # Hash of the extracted fields
+    last_checked: Optional[datetime] = None  # Latest scrape that found this content
+    last_changed: Optional[datetime] = None  # First scrape that found this content
+
+# Fields filled from page extractions, as opposed to bookkeeping
+EXTRACTED_FIELDS = [
+    'domain', 'website', 'email', 'contact_number', 'mobile_number', 'stage', 'focus_industry',
+    'focus_sector', 'service_area', 'location', 'active_years', 'engagement_level',
+    'active_on_portal', 'name', 'about_company',
+]
 
-class ScrapeRequest(BaseModel):
+class CrawlSettings(BaseModel):
+    # Company website crawl budget; CRAWL_MAX_DEPTH and CRAWL_MAX_PAGES when unset
+    crawl_depth: Optional[int] = Field(None, ge=0, le=3)
+    crawl_pages: Optional[int] = Field(None, ge=0, le=20)
+
+    def crawl_limits(self) -> Optional["CrawlLimits"]:
+        if self.crawl_depth is None and self.crawl_pages is None:
+            return None
+        return CrawlLimits(
+            CRAWL_MAX_DEPTH if self.crawl_depth is None else self.crawl_depth,
+            CRAWL_MAX_PAGES if self.crawl_pages is None else self.crawl_pages,
+        )
+
+class ScrapeRequest(CrawlSettings):
     url: str
+    max_age: Optional[int] = None  # Seconds a cached copy may be reused without revalidating
 
-class BulkScrapeRequest(BaseModel):
+class BulkScrapeRequest(CrawlSettings):
     urls: List[str]
 
 class APIKey(BaseModel):
@@ -80,193 +280,1847 @@ class APIKey(BaseModel):
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     last_used: Optional[datetime] = None
     is_active: bool = True
+    deactivated_at: Optional[datetime] = None
+    rate_limit: Optional[float] = None  # Tokens per second; RATE_LIMIT_RATE when unset
+    burst: Optional[int] = None  # Bucket size; RATE_LIMIT_BURST when unset
 
 class APIKeyCreate(BaseModel):
     name: str
+    rate_limit: Optional[float] = Field(None, gt=0)
+    burst: Optional[int] = Field(None, ge=1)
+
+class ScrapeJob(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    source: str = "bulk"  # bulk, csv, refresh
+    status: str = "queued"  # queued, running, completed, cancelled
+    total: int = 0
+    processed: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    ingesting: bool = False  # More URLs are still being added (CSV upload)
+    csv: Optional[Dict[str, Any]] = None  # CSV reader counts, once the whole upload is read
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+class CSVUploadSummary(BaseModel):
+    job: ScrapeJob
+    url_column: str
+    rows: int
+    accepted: int
+    duplicates: int
+    invalid: int
+    empty: int
+    invalid_samples: List[Dict[str, Any]] = []
 
 # Helper Functions for Scraping
+EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+# Maximal runs of phone-like characters; cheap to scan for and bounded by non-digits
+PHONE_CANDIDATE_RE = re.compile(r'[+(\d][\d()\s+-]{8,}\d')
+PHONE_RE = re.compile(
+    # Indian numbers: optional +91 or trunk 0, ten digits, not part of a longer digit run
+    r'(?<![\d+])(?P<indian>(?:\+91[\s-]?|0)?\d{10})(?!\d)'
+    r'|(?<!\d)(?P<grouped>\(\d{3}\)[\s-]?\d{3}[\s-]?\d{4}|\d{3}[\s-]\d{3}[\s-]\d{4})(?!\d)'
+)
+_NON_DIGIT_RE = re.compile(r'\D')
+
+def normalize_phone_number(raw: str) -> str:
+    """Return Indian numbers in E.164 form (+91XXXXXXXXXX); other numbers unchanged"""
+    digits = _NON_DIGIT_RE.sub('', raw)
+    if raw.startswith('+91') and len(digits) == 12:
+        return '+' + digits
+    if len(digits) == 11 and digits[0] == '0':
+        return '+91' + digits[1:]
+    if len(digits) == 10 and digits[0] in '6789':
+        return '+91' + digits
+    return raw
+
+def extract_contacts(text: str, emails: bool = True, phones: bool = True) -> Tuple[List[str], List[str]]:
+    """Find emails and phone numbers in ``text`` with precompiled patterns.
+
+    Both lists keep the order in which contacts first appear and contain no
+    duplicates; phone numbers are normalised first so that different spellings
+    of one number collapse into one entry. Text without an '@' is never scanned
+    for emails, and the strict phone pattern only runs inside short
+    phone-like candidate runs rather than over the whole text.
+    """
+    found_emails: Dict[str, None] = {}
+    found_phones: Dict[str, None] = {}
+    
+    if emails and '@' in text:
+        for match in EMAIL_RE.finditer(text):
+            found_emails[match.group()] = None
+    
+    if phones:
+        for candidate in PHONE_CANDIDATE_RE.finditer(text):
+            for match in PHONE_RE.finditer(candidate.group()):
+                found_phones[normalize_phone_number(match.group(match.lastgroup))] = None
+    
+    return list(found_emails), list(found_phones)
+
 def extract_emails(text: str) -> List[str]:
     """Extract email addresses from text"""
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    return list(set(re.findall(email_pattern, text)))
+    return extract_contacts(text, phones=False)[0]
 
 def extract_phone_numbers(text: str) -> List[str]:
     """Extract phone numbers from text"""
-    # Indian phone number patterns
-    patterns = [
-        r'\+91[\s-]?\d{10}',
-        r'\d{10}',
-        r'\(\d{3}\)[\s-]?\d{3}[\s-]?\d{4}',
-        r'\d{3}[\s-]\d{3}[\s-]\d{4}'
-    ]
-    phones = []
-    for pattern in patterns:
-        phones.extend(re.findall(pattern, text))
-    return list(set(phones))
-
-def scrape_startup_india_page(url: str) -> Dict[str, Any]:
-    """Scrape startup India portal page"""
+    return extract_contacts(text, emails=False)[1]
+
+# Shared HTTP client
+http_session: Optional[aiohttp.ClientSession] = None
+
+def get_http_session() -> aiohttp.ClientSession:
+    """Return the shared pooled HTTP session, creating it on first use"""
+    global http_session
+    if http_session is None or http_session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_POOL_SIZE,
+            limit_per_host=HTTP_POOL_PER_HOST,
+            use_dns_cache=True,
+            ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+            keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=HTTP_TOTAL_TIMEOUT,
+            connect=HTTP_CONNECT_TIMEOUT,
+            sock_read=HTTP_READ_TIMEOUT,
+        )
+        http_session = aiohttp.ClientSession(
+            connector=connector, timeout=timeout, headers=SCRAPE_HEADERS, trace_configs=[http_trace_config()]
+        )
+    return http_session
+
+def http_trace_config() -> aiohttp.TraceConfig:
+    """Time DNS lookups, new connections and time to response headers per host"""
+    async def on_request_start(session, ctx, params):
+        ctx.host = metric_host(params.url.host or '')
+        ctx.started = time.perf_counter()
+    
+    async def on_dns_resolvehost_start(session, ctx, params):
+        ctx.dns_started = time.perf_counter()
+    
+    async def on_dns_resolvehost_end(session, ctx, params):
+        HTTP_PHASE_SECONDS.labels('dns', ctx.host).observe(time.perf_counter() - ctx.dns_started)
+    
+    async def on_connection_create_start(session, ctx, params):
+        ctx.connect_started = time.perf_counter()
+    
+    async def on_connection_create_end(session, ctx, params):
+        HTTP_PHASE_SECONDS.labels('connect', ctx.host).observe(time.perf_counter() - ctx.connect_started)
+    
+    async def on_request_end(session, ctx, params):
+        HTTP_PHASE_SECONDS.labels('headers', ctx.host).observe(time.perf_counter() - ctx.started)
+    
+    trace = aiohttp.TraceConfig()
+    trace.on_request_start.append(on_request_start)
+    trace.on_dns_resolvehost_start.append(on_dns_resolvehost_start)
+    trace.on_dns_resolvehost_end.append(on_dns_resolvehost_end)
+    trace.on_connection_create_start.append(on_connection_create_start)
+    trace.on_connection_create_end.append(on_connection_create_end)
+    trace.on_request_end.append(on_request_end)
+    return trace
+
+class FetchedPage(NamedTuple):
+    status: int
+    content: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    encoding: Optional[str] = None  # Charset from the Content-Type header
+    truncated: bool = False  # Body ended early at a StopMarker or FETCH_MAX_BYTES
+
+class StopMarker(NamedTuple):
+    """Where a download may end: right after ``end``, once every ``requires`` pattern was seen"""
+    end: re.Pattern
+    requires: Tuple[re.Pattern, ...] = ()
+
+HTML_CONTENT_TYPES = frozenset(['text/html', 'application/xhtml+xml'])
+
+class UnsupportedContentError(Exception):
+    """Raised for responses that are not HTML"""
+
+def known_encoding(charset: Optional[str]) -> Optional[str]:
+    """Return ``charset`` if Python can decode it, otherwise None"""
+    if not charset:
+        return None
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        return codecs.lookup(charset).name
+    except LookupError:
+        return None
+
+async def read_html_body(response: aiohttp.ClientResponse, stop_at: Optional[StopMarker] = None) -> Tuple[bytes, bool]:
+    """Stream a body up to FETCH_MAX_BYTES, stopping where ``stop_at`` allows.
+
+    Returns the bytes read and whether the rest of the body was skipped. A body
+    cut off by the size cap ends before its last ``<`` so no tag or multi-byte
+    character is split.
+    """
+    body = bytearray()
+    missing = list(stop_at.requires) if stop_at is not None else []
+    ready_at = 0  # The end marker only counts after the last required match
+    async for chunk in response.content.iter_chunked(FETCH_CHUNK_SIZE):
+        search_from = max(0, len(body) - 256)  # A match may straddle two chunks
+        body += chunk
+        if stop_at is not None:
+            for pattern in list(missing):
+                match = pattern.search(body, search_from)
+                if match:
+                    missing.remove(pattern)
+                    ready_at = max(ready_at, match.end())
+            if not missing:
+                match = stop_at.end.search(body, max(search_from, ready_at))
+                if match:
+                    return bytes(body[:match.end()]), True
+        if len(body) >= FETCH_MAX_BYTES:
+            cut = body.rfind(b'<', 0, FETCH_MAX_BYTES)
+            logger.info(f"Truncated {response.url} at {FETCH_MAX_BYTES} bytes")
+            return bytes(body[:cut if cut > 0 else FETCH_MAX_BYTES]), True
+    return bytes(body), False
+
+# Fetch retries and per-host circuit breakers
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+class CircuitOpenError(Exception):
+    """Raised instead of fetching while a host's circuit breaker is open"""
+
+    def __init__(self, message: str, retry_in: float):
+        super().__init__(message)
+        self.retry_in = retry_in  # Seconds until the breaker lets a request through
+
+class CircuitBreaker:
+    """Consecutive-failure breaker for one host.
+
+    ``threshold`` transient failures in a row open the breaker and requests
+    fail fast for ``reset_after`` seconds. Then a single probe request is let
+    through (half-open): success closes the breaker, failure opens it again.
+    """
+
+    def __init__(self, threshold: int, reset_after: float):
+        self.threshold = max(1, threshold)
+        self.reset_after = reset_after
+        self.state = "closed"  # closed, open, half_open
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_started_at = 0.0
+
+    def before_request(self, host: str):
+        now = time.monotonic()
+        if self.state == "open":
+            retry_in = self.reset_after - (now - self.opened_at)
+            if retry_in > 0:
+                raise CircuitOpenError(f"Circuit open for {host}; retrying in {retry_in:.0f}s", retry_in)
+            self.state = "half_open"
+        elif self.state == "half_open":
+            # Only one probe at a time, unless the last one never reported back
+            retry_in = self.reset_after - (now - self.probe_started_at)
+            if retry_in > 0:
+                raise CircuitOpenError(f"Circuit half-open for {host}; waiting on a probe request", retry_in)
+        else:
+            return
+        self.probe_started_at = now
+
+    def record_success(self):
+        self.state = "closed"
+        self.failures = 0
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.threshold:
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        retry_in = max(0.0, self.reset_after - (time.monotonic() - self.opened_at)) if self.state == "open" else 0.0
+        return {"state": self.state, "failures": self.failures, "retry_in": round(retry_in, 1)}
+
+class CircuitBreakers:
+    """Circuit breakers by host, created on first use"""
+
+    def __init__(self, threshold: int, reset_after: float, max_hosts: int = 1024):
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.max_hosts = max_hosts
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, host: str) -> CircuitBreaker:
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            if len(self._breakers) >= self.max_hosts:
+                # Healthy hosts carry no state worth keeping
+                for known in [h for h, b in self._breakers.items() if b.state == "closed" and b.failures == 0]:
+                    del self._breakers[known]
+            breaker = self._breakers[host] = CircuitBreaker(self.threshold, self.reset_after)
+        return breaker
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Hosts that are failing or cut off, and how many hosts are tracked"""
+        return {
+            "hosts_tracked": len(self._breakers),
+            "hosts": {
+                host: breaker.snapshot() for host, breaker in self._breakers.items()
+                if breaker.state != "closed" or breaker.failures
+            },
         }
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        data = {}
-        
-        # Extract name
-        name_elem = soup.find('h1') or soup.find('h2', class_=re.compile('name|title', re.I))
-        if name_elem:
-            data['name'] = name_elem.get_text(strip=True)
-        
-        # Extract all text for parsing
-        all_text = soup.get_text()
-        
-        # Extract structured data from the page
-        labels = soup.find_all(['dt', 'label', 'span', 'div'], class_=re.compile('label|key|field', re.I))
-        for label in labels:
-            label_text = label.get_text(strip=True).lower()
-            value_elem = label.find_next_sibling() or label.parent.find_next('dd') or label.find_next('span')
-            
-            if value_elem:
-                value = value_elem.get_text(strip=True)
-                
-                if 'website' in label_text or 'url' in label_text:
-                    data['website'] = value
-                elif 'email' in label_text:
-                    data['email'] = value
-                elif 'phone' in label_text or 'contact' in label_text or 'mobile' in label_text:
-                    if 'mobile' in label_text:
-                        data['mobile_number'] = value
-                    else:
-                        data['contact_number'] = value
-                elif 'stage' in label_text:
-                    data['stage'] = value
-                elif 'industry' in label_text:
-                    data['focus_industry'] = value
-                elif 'sector' in label_text:
-                    data['focus_sector'] = value
-                elif 'service' in label_text:
-                    data['service_area'] = value
-                elif 'location' in label_text or 'address' in label_text or 'city' in label_text:
-                    data['location'] = value
-                elif 'year' in label_text or 'active' in label_text:
-                    data['active_years'] = value
-                elif 'engagement' in label_text:
-                    data['engagement_level'] = value
-                elif 'portal' in label_text:
-                    data['active_on_portal'] = value
-        
-        # Extract emails and phones from full text if not found
-        if not data.get('email'):
-            emails = extract_emails(all_text)
-            if emails:
-                data['email'] = emails[0]
-        
-        if not data.get('contact_number') and not data.get('mobile_number'):
-            phones = extract_phone_numbers(all_text)
-            if phones:
-                data['contact_number'] = phones[0] if len(phones) > 0 else None
-                data['mobile_number'] = phones[1] if len(phones) > 1 else None
-        
-        # Extract domain
-        if data.get('website'):
-            domain_match = re.search(r'(?:https?://)?(?:www\.)?([^/]+)', data['website'])
-            if domain_match:
-                data['domain'] = domain_match.group(1)
+
+circuit_breakers = CircuitBreakers(BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_SECONDS)
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+async def fetch_page(url: str, headers: Optional[Dict[str, str]] = None, stop_at: Optional[StopMarker] = None) -> FetchedPage:
+    """Fetch an HTML page through the shared session, honouring per-host politeness.
+
+    The body is streamed through ``read_html_body`` and non-HTML responses
+    raise UnsupportedContentError without being read.
+
+    Timeouts, connection errors and 429/5xx responses are retried up to
+    FETCH_RETRIES times with jittered exponential backoff, waiting at least as
+    long as any Retry-After header asks. Every attempt counts towards the host's
+    circuit breaker, which fails the fetch at once while it is open.
+    """
+    session = get_http_session()
+    host = url_host(url)
+    breaker = circuit_breakers.get(host)
+    for attempt in range(FETCH_RETRIES + 1):
+        breaker.before_request(host)
+        retry_after = None
+        try:
+            async with scrape_scheduler.host_slot(url):
+                async with session.get(url, headers=headers) as response:
+                    if response.status in RETRYABLE_STATUSES:
+                        retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                    response.raise_for_status()
+                    breaker.record_success()
+                    etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+                    if response.status == 304:
+                        return FetchedPage(response.status, b'', etag, last_modified)
+                    
+                    if 'Content-Type' in response.headers and response.content_type not in HTML_CONTENT_TYPES:
+                        raise UnsupportedContentError(f"Unsupported content type {response.content_type} at {url}")
+                    content, truncated = await read_html_body(response, stop_at)
+                    return FetchedPage(
+                        response.status, content, etag, last_modified,
+                        known_encoding(response.charset), truncated,
+                    )
+        except aiohttp.ClientResponseError as e:
+            if e.status not in RETRYABLE_STATUSES:
+                breaker.record_success()  # The host is up; the page just isn't there
+                raise
+            error = e
+        except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError) as e:
+            error = e
         
-        return data
+        breaker.record_failure()
+        if attempt == FETCH_RETRIES:
+            raise error
+        delay = random.uniform(0, min(FETCH_BACKOFF_MAX, FETCH_BACKOFF_BASE * 2 ** attempt))
+        if retry_after is not None:
+            if retry_after > FETCH_RETRY_AFTER_MAX:
+                raise error
+            delay = max(delay, retry_after)
+        logger.info(f"Retrying {url} in {delay:.1f}s after {type(error).__name__}: {error}")
+        await asyncio.sleep(delay)
+
+# HTTP response cache
+class CachedResponse:
+    """A fetched page kept compressed together with its validators and extractions"""
+    __slots__ = ('body', 'etag', 'last_modified', 'encoding', 'fetched_at', 'extractions', 'archive', 'truncated', 'stop_at', 'size')
+
+    def __init__(self, content: bytes, etag: Optional[str], last_modified: Optional[str], encoding: Optional[str] = None):
+        self.body = zlib.compress(content)
+        self.etag = etag
+        self.last_modified = last_modified
+        self.encoding = encoding
+        self.fetched_at = time.monotonic()
+        self.extractions: Dict[str, Dict[str, Any]] = {}
+        self.archive: Optional[Dict[str, Any]] = None
+        self.truncated = False
+        self.stop_at: Optional[StopMarker] = None  # What ended the download when truncated
+        self.size = len(self.body) + 512  # Rough allowance for validators and extractions
+
+    @property
+    def content(self) -> bytes:
+        return zlib.decompress(self.body)
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+class ResponseCache:
+    """URL-keyed LRU of fetched pages bounded by total compressed size"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        entry = self._entries.get(url)
+        if entry is not None:
+            self._entries.move_to_end(url)
+        return entry
+
+    def put(self, url: str, entry: CachedResponse):
+        if entry.size > self.max_bytes:
+            return
+        previous = self._entries.pop(url, None)
+        if previous is not None:
+            self.size -= previous.size
+        self._entries[url] = entry
+        self.size += entry.size
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= evicted.size
+
+response_cache = ResponseCache(HTTP_CACHE_MAX_BYTES)
+
+# Raw HTML archive
+#
+# Every freshly fetched page is stored zstd-compressed under the SHA-256 of its
+# bytes, so identical pages are kept once and reextract.py can re-run the
+# parsers over stored pages without touching the network.
+class HTMLArchive(ABC):
+    """Content-addressed store of compressed pages"""
+
+    @abstractmethod
+    async def put(self, content: bytes) -> str:
+        """Store a page unless it is already there; returns its key"""
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes:
+        """Return the compressed page stored under ``key``"""
+
+    @staticmethod
+    def compress(content: bytes) -> bytes:
+        return zstandard.ZstdCompressor(level=HTML_ARCHIVE_ZSTD_LEVEL).compress(content)
+
+    @staticmethod
+    def decompress(blob: bytes) -> bytes:
+        return zstandard.ZstdDecompressor().decompress(blob)
+
+class LocalHTMLArchive(HTMLArchive):
+    """Pages as <dir>/<ab>/<sha256>.html.zst files on this host"""
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.html.zst"
+
+    def _write(self, key: str, content: bytes):
+        path = self.path(key)
+        if path.exists():
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+        tmp.write_bytes(self.compress(content))
+        os.replace(tmp, path)
+
+    async def put(self, content: bytes) -> str:
+        key = hashlib.sha256(content).hexdigest()
+        await asyncio.to_thread(self._write, key, content)
+        return key
+
+    async def get(self, key: str) -> bytes:
+        return await asyncio.to_thread(self.path(key).read_bytes)
+
+class GridFSHTMLArchive(HTMLArchive):
+    """Pages in the html_archive GridFS bucket, named by their hash"""
+
+    def _bucket(self) -> AsyncIOMotorGridFSBucket:
+        return AsyncIOMotorGridFSBucket(db, bucket_name='html_archive')
+
+    async def put(self, content: bytes) -> str:
+        key = hashlib.sha256(content).hexdigest()
+        if await db.html_archive.files.find_one({"filename": key}, {"_id": 1}) is None:
+            blob = await asyncio.to_thread(self.compress, content)
+            await self._bucket().upload_from_stream(key, blob)
+        return key
+
+    async def get(self, key: str) -> bytes:
+        stream = await self._bucket().open_download_stream_by_name(key)
+        return await stream.read()
+
+def make_html_archive(backend: str) -> Optional[HTMLArchive]:
+    if backend == 'local':
+        return LocalHTMLArchive(HTML_ARCHIVE_DIR)
+    if backend == 'gridfs':
+        return GridFSHTMLArchive()
+    return None
+
+html_archive = make_html_archive(HTML_ARCHIVE_BACKEND)
+
+async def archive_page(url: str, content: bytes, encoding: Optional[str], truncated: bool = False) -> Optional[Dict[str, Any]]:
+    """Store a fetched page and return the reference saved with the result"""
+    if html_archive is None or not content:
+        return None
+    try:
+        key = await html_archive.put(content)
     except Exception as e:
-        logger.error(f"Error scraping startup page: {e}")
+        logger.error(f"Error archiving {url}: {e}")
+        return None
+    ref = {"sha256": key, "encoding": encoding, "url": url}
+    if truncated:
+        ref["truncated"] = True  # Only the start of the page was downloaded
+    return ref
+
+class PageExtraction(NamedTuple):
+    data: Dict[str, Any]
+    archive: Optional[Dict[str, Any]] = None  # Reference to the archived page
+
+async def fetch_and_parse(
+    url: str,
+    parser: Callable[..., Dict[str, Any]],
+    max_age: Optional[int] = None,
+    stop_at: Optional[StopMarker] = None,
+    stage: str = 'page',
+) -> Dict[str, Any]:
+    """Fetch ``url`` and run ``parser`` on it, reusing cached pages where possible.
+
+    A cached copy younger than ``max_age`` seconds is used without any request.
+    Otherwise the page is revalidated with If-None-Match / If-Modified-Since and
+    a 304 reuses the previous extraction without parsing again. ``stop_at`` ends
+    the download once the parser has everything it needs. Fetching and parsing
+    are timed as the ``fetch_<stage>`` and ``parse_<stage>`` stages. Returns the
+    extraction together with where the page it came from is archived.
+
+    A cached page that was cut short is only reused by callers stopping at
+    the same point, since anyone else needs the rest of it.
+    """
+    entry = response_cache.get(url)
+    parser_name = parser.__name__
+    if entry is not None and entry.truncated and entry.stop_at != stop_at:
+        entry = None
+    
+    if entry is not None and max_age is not None and entry.age <= max_age and parser_name in entry.extractions:
+        RESPONSE_CACHE_TOTAL.labels('hit').inc()
+        return PageExtraction(dict(entry.extractions[parser_name]), entry.archive)
+    RESPONSE_CACHE_TOTAL.labels('revalidate' if entry is not None else 'miss').inc()
+    
+    headers = {}
+    if entry is not None:
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+    
+    started = time.perf_counter()
+    try:
+        page = await fetch_page(url, headers, stop_at)
+    except Exception as e:
+        observe_stage(f'fetch_{stage}', url, 'circuit_open' if isinstance(e, CircuitOpenError) else 'error', started)
         raise
+    observe_stage(f'fetch_{stage}', url, 'not_modified' if page.status == 304 else 'ok', started)
+    
+    if page.status == 304 and entry is not None:
+        entry.fetched_at = time.monotonic()
+        if parser_name not in entry.extractions:
+            entry.extractions[parser_name] = await timed_parse(parser, entry.content, entry.encoding, stage, url)
+        return PageExtraction(dict(entry.extractions[parser_name]), entry.archive)
+    
+    data, archive = await asyncio.gather(
+        timed_parse(parser, page.content, page.encoding, stage, url),
+        archive_page(url, page.content, page.encoding, page.truncated),
+    )
+    entry = CachedResponse(page.content, page.etag, page.last_modified, page.encoding)
+    if page.truncated:
+        entry.truncated, entry.stop_at = True, stop_at
+    entry.extractions[parser_name] = data
+    entry.archive = archive
+    response_cache.put(url, entry)
+    return PageExtraction(dict(data), archive)
 
-def scrape_website_details(website_url: str) -> Dict[str, Any]:
-    """Scrape additional details from company website"""
+async def timed_parse(parser, content: bytes, encoding: Optional[str], stage: str, url: str) -> Dict[str, Any]:
+    started = time.perf_counter()
     try:
-        if not website_url.startswith('http'):
-            website_url = 'https://' + website_url
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(website_url, headers=headers, timeout=15)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        data = {}
-        
-        # Get all text
-        all_text = soup.get_text()
+        data = await run_parser(parser, content, encoding)
+    except Exception:
+        observe_stage(f'parse_{stage}', url, 'error', started)
+        raise
+    observe_stage(f'parse_{stage}', url, 'ok', started)
+    return data
+
+def _resolve_html_parser(name: str) -> str:
+    """Fall back to the stdlib parser when the configured backend is not installed"""
+    try:
+        BeautifulSoup("", name)
+        return name
+    except FeatureNotFound:
+        logger.warning(f"HTML parser '{name}' is not available, using html.parser")
+        return 'html.parser'
+
+HTML_PARSER = _resolve_html_parser(HTML_PARSER)
+
+def make_soup(content: bytes, encoding: Optional[str] = None) -> BeautifulSoup:
+    """Parse HTML with the configured parser backend.
+
+    A charset from the HTTP headers takes precedence over <meta> declarations
+    and guessing.
+    """
+    return BeautifulSoup(content, HTML_PARSER, from_encoding=encoding)
+
+LABEL_CLASS_RE = re.compile('label|key|field', re.I)
+NAME_CLASS_RE = re.compile('name|title', re.I)
+LABEL_TAGS = frozenset(['dt', 'label', 'span', 'div'])
+
+# Profile label keywords -> ScrapedData field. Rows are checked in order and the
+# first row with a keyword contained in the label text wins.
+LABEL_FIELD_KEYWORDS = (
+    (('website', 'url'), 'website'),
+    (('email',), 'email'),
+    (('mobile',), 'mobile_number'),
+    (('phone', 'contact'), 'contact_number'),
+    (('stage',), 'stage'),
+    (('industry',), 'focus_industry'),
+    (('sector',), 'focus_sector'),
+    (('service',), 'service_area'),
+    (('location', 'address', 'city'), 'location'),
+    (('year', 'active'), 'active_years'),
+    (('engagement',), 'engagement_level'),
+    (('portal',), 'active_on_portal'),
+)
+
+@lru_cache(maxsize=4096)
+def label_field(label_text: str) -> Optional[str]:
+    """Map a lower-cased profile label to the ScrapedData field it describes"""
+    for keywords, field in LABEL_FIELD_KEYWORDS:
+        if any(keyword in label_text for keyword in keywords):
+            return field
+    return None
+
+def _class_matches(tag, pattern: re.Pattern) -> bool:
+    classes = tag.get('class')
+    if not classes:
+        return False
+    if isinstance(classes, str):
+        return bool(pattern.search(classes))
+    return any(pattern.search(cls) for cls in classes)
+
+def extract_profile_fields(soup: BeautifulSoup) -> Dict[str, Any]:
+    """Collect name and label->value pairs from a profile page in one tree walk.
+
+    A label's value is its next sibling element, else the first <dd> after the
+    label's parent, else the first <span> after the label. Those forward
+    lookups are answered from tables built during the same walk instead of
+    re-scanning the document for every label.
+    """
+    elements = soup.find_all(True)
+    position = {id(element): index for index, element in enumerate(elements)}
+    
+    # next_dd[i] / next_span[i]: first <dd>/<span> at a position greater than i
+    count = len(elements)
+    next_dd = [None] * (count + 1)
+    next_span = [None] * (count + 1)
+    following_dd = following_span = None
+    for index in range(count - 1, -1, -1):
+        next_dd[index] = following_dd
+        next_span[index] = following_span
+        name = elements[index].name
+        if name == 'dd':
+            following_dd = elements[index]
+        elif name == 'span':
+            following_span = elements[index]
+    next_dd[count] = following_dd  # Used for labels whose parent is the document itself
+    
+    data = {}
+    h1 = h2 = None
+    for index, element in enumerate(elements):
+        name = element.name
+        if name == 'h1':
+            h1 = h1 or element
+        elif name == 'h2' and h2 is None and _class_matches(element, NAME_CLASS_RE):
+            h2 = element
+        if name not in LABEL_TAGS or not _class_matches(element, LABEL_CLASS_RE):
+            continue
         
-        # Extract about section
-        about_section = soup.find(['section', 'div'], class_=re.compile('about|description|overview', re.I))
-        if about_section:
-            about_text = about_section.get_text(strip=True)
-            data['about_company'] = about_text[:500] if len(about_text) > 500 else about_text
+        parent_index = position.get(id(element.parent), count)
+        value_elem = element.find_next_sibling() or next_dd[parent_index] or next_span[index]
+        if value_elem is None:
+            continue
         
-        # Extract contact info
-        emails = extract_emails(all_text)
+        field = label_field(element.get_text(strip=True).lower())
+        if field:
+            data[field] = value_elem.get_text(strip=True)
+    
+    name_elem = h1 or h2
+    if name_elem:
+        data['name'] = name_elem.get_text(strip=True)
+    return data
+
+def parse_startup_india_page(content: bytes, encoding: Optional[str] = None) -> Dict[str, Any]:
+    """Extract startup details from a startup India portal page"""
+    soup = make_soup(content, encoding)
+    data = extract_profile_fields(soup)
+    
+    # Extract emails and phones from full text if not found
+    need_email = not data.get('email')
+    need_phones = not data.get('contact_number') and not data.get('mobile_number')
+    if need_email or need_phones:
+        emails, phones = extract_contacts(soup.get_text(), emails=need_email, phones=need_phones)
         if emails:
             data['email'] = emails[0]
-        
-        phones = extract_phone_numbers(all_text)
         if phones:
             data['contact_number'] = phones[0] if len(phones) > 0 else None
             data['mobile_number'] = phones[1] if len(phones) > 1 else None
-        
-        # Extract location from footer or contact section
-        contact_section = soup.find(['section', 'div', 'footer'], class_=re.compile('contact|footer|address', re.I))
-        if contact_section:
-            contact_text = contact_section.get_text()
-            # Look for location patterns
-            location_match = re.search(r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*,\s*[A-Z][a-z]+)', contact_text)
-            if location_match:
-                data['location'] = location_match.group(1)
-        
-        return data
+    
+    # Labelled numbers get the same E.164 form as the ones found in the text
+    for field in ('contact_number', 'mobile_number'):
+        if data.get(field):
+            data[field] = normalize_phone_number(data[field])
+    
+    # Extract domain
+    if data.get('website'):
+        domain_match = re.search(r'(?:https?://)?(?:www\.)?([^/]+)', data['website'])
+        if domain_match:
+            data['domain'] = domain_match.group(1)
+    
+    return data
+
+# HTML parsing process pool
+parse_pool: Optional[ProcessPoolExecutor] = None
+
+def spawn_process_pool(workers: int) -> ProcessPoolExecutor:
+    """Process pool for parse_* functions and other CPU-bound page work"""
+    # spawn keeps the children free of the parent's event loop and Mongo threads
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+def start_parse_pool():
+    """Start the parser process pool unless parsing is configured in-process"""
+    global parse_pool
+    if PARSE_WORKERS > 0 and parse_pool is None:
+        parse_pool = spawn_process_pool(PARSE_WORKERS)
+
+def stop_parse_pool():
+    global parse_pool
+    if parse_pool is not None:
+        parse_pool.shutdown(wait=False, cancel_futures=True)
+        parse_pool = None
+
+parses_in_progress = 0
+
+async def run_parser(parser, content: bytes, encoding: Optional[str] = None) -> Dict[str, Any]:
+    """Run a parse_* function on raw page bytes in the process pool, or inline without one"""
+    global parses_in_progress
+    pool = parse_pool
+    if pool is None:
+        return parser(content, encoding)
+    parses_in_progress += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(pool, parser, content, encoding)
+    except BrokenProcessPool:
+        if parse_pool is pool:
+            logger.error("Parser process pool broke, restarting it")
+            stop_parse_pool()
+            start_parse_pool()
+        return parser(content, encoding)
+    finally:
+        parses_in_progress -= 1
+
+async def scrape_startup_india_page(url: str, max_age: Optional[int] = None) -> PageExtraction:
+    """Scrape startup India portal page"""
+    try:
+        return await fetch_and_parse(url, parse_startup_india_page, max_age, stage='startup')
+    except Exception as e:
+        logger.error(f"Error scraping startup page: {e}")
+        raise
+
+CONTACT_LINK_RE = re.compile(r'contact|reach[-_ ]?us|get[-_ ]?in[-_ ]?touch|impressum|imprint', re.I)
+ABOUT_LINK_RE = re.compile(r'about|company|who[-_ ]?we[-_ ]?are|team', re.I)
+CRAWL_LINKS_PER_PAGE = 10
+
+def parse_website_details(content: bytes, encoding: Optional[str] = None) -> Dict[str, Any]:
+    """Extract contact and about details from a company website page"""
+    soup = make_soup(content, encoding)
+    data = {}
+    
+    # Get all text
+    all_text = soup.get_text()
+    
+    # Extract about section
+    about_section = soup.find(['section', 'div'], class_=re.compile('about|description|overview', re.I))
+    if about_section:
+        about_text = about_section.get_text(strip=True)
+        data['about_company'] = about_text[:500] if len(about_text) > 500 else about_text
+    
+    # Extract contact info
+    emails, phones = extract_contacts(all_text)
+    if emails:
+        data['email'] = emails[0]
+    
+    if phones:
+        data['contact_number'] = phones[0] if len(phones) > 0 else None
+        data['mobile_number'] = phones[1] if len(phones) > 1 else None
+    
+    # Extract location from footer or contact section
+    contact_section = soup.find(['section', 'div', 'footer'], class_=re.compile('contact|footer|address', re.I))
+    if contact_section:
+        contact_text = contact_section.get_text()
+        # Look for location patterns
+        location_match = re.search(r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*,\s*[A-Z][a-z]+)', contact_text)
+        if location_match:
+            data['location'] = location_match.group(1)
+    
+    # Links worth crawling for the details above, contact pages first
+    ranked = []
+    for link in soup.find_all('a', href=True):
+        href = link['href'].strip()
+        if not href or href.startswith(('#', 'mailto:', 'tel:', 'javascript:')):
+            continue
+        label = f"{href} {link.get_text(' ', strip=True)}"
+        if CONTACT_LINK_RE.search(label):
+            ranked.append((0, href))
+        elif ABOUT_LINK_RE.search(label):
+            ranked.append((1, href))
+    data['crawl_links'] = list(dict.fromkeys(href for _, href in sorted(ranked, key=lambda r: r[0])))[:CRAWL_LINKS_PER_PAGE]
+    
+    return data
+
+# A company site's details are in place once an email address and an about or
+# contact section have appeared and a footer closes after them. Earlier footers,
+# e.g. inside articles or quotes, don't end the download.
+WEBSITE_STOP = StopMarker(
+    re.compile(rb'</footer\s*>', re.I),
+    (
+        re.compile(rb'[\w.+-]+@[\w-]+\.[\w.-]+'),
+        re.compile(rb'class\s*=\s*["\'][^"\']*(?:about|contact|address)', re.I),
+    ),
+)
+
+def website_base_url(website_url: str) -> str:
+    return website_url if website_url.startswith('http') else 'https://' + website_url
+
+async def scrape_website_details(website_url: str, max_age: Optional[int] = None) -> PageExtraction:
+    """Scrape additional details from company website"""
+    try:
+        website_url = website_base_url(website_url)
+        return await fetch_and_parse(website_url, parse_website_details, max_age, stop_at=WEBSITE_STOP, stage='website')
     except Exception as e:
         logger.error(f"Error scraping website: {e}")
-        return {}
+        return PageExtraction({})
+
+# Company website crawl
+#
+# Contact details are often on a site's contact or about page rather than its
+# landing page. Links to such pages are followed breadth-first, within a depth
+# and page budget, until every CRAWL_TARGET_FIELDS value is known. Pages the
+# site's robots.txt disallows are skipped.
+CRAWL_TARGET_FIELDS = ['email', 'contact_number', 'about_company', 'location']
+
+class CrawlLimits(NamedTuple):
+    depth: int = CRAWL_MAX_DEPTH  # Link hops followed from the landing page
+    pages: int = CRAWL_MAX_PAGES  # Pages fetched besides the landing page
+
+class RobotsCache:
+    """Parsed robots.txt per site origin, fetched once per ``ttl`` seconds"""
+
+    def __init__(self, size: int, ttl: float):
+        self.size = max(1, size)
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, RobotFileParser]]" = OrderedDict()
+        self._loading: Dict[str, asyncio.Future] = {}
+
+    async def allowed(self, url: str) -> bool:
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        entry = self._entries.get(origin)
+        if entry is not None and time.monotonic() - entry[0] <= self.ttl:
+            self._entries.move_to_end(origin)
+            return entry[1].can_fetch(SCRAPE_HEADERS['User-Agent'], url)
+        
+        # Concurrent lookups for one site share a single robots.txt fetch
+        task = self._loading.get(origin)
+        if task is None:
+            task = asyncio.ensure_future(self._load(origin))
+            self._loading[origin] = task
+            task.add_done_callback(lambda _: self._loading.pop(origin, None))
+        parser = await asyncio.shield(task)
+        return parser.can_fetch(SCRAPE_HEADERS['User-Agent'], url)
+
+    async def _load(self, origin: str) -> RobotFileParser:
+        parser = RobotFileParser(f"{origin}/robots.txt")
+        # As in RFC 9309: a missing file allows everything, an unreachable one nothing
+        try:
+            async with scrape_scheduler.host_slot(origin):
+                async with get_http_session().get(f"{origin}/robots.txt", headers=SCRAPE_HEADERS) as response:
+                    if response.status >= 500:
+                        parser.disallow_all = True
+                    elif response.status >= 400:
+                        parser.allow_all = True
+                    else:
+                        body = bytearray()
+                        async for chunk in response.content.iter_chunked(FETCH_CHUNK_SIZE):
+                            body += chunk
+                            if len(body) >= ROBOTS_MAX_BYTES:
+                                break
+                        parser.parse(bytes(body[:ROBOTS_MAX_BYTES]).decode('utf-8', errors='replace').splitlines())
+        except Exception as e:
+            logger.info(f"Error fetching {origin}/robots.txt: {e}")
+            parser.disallow_all = True
+        parser.modified()
+        
+        self._entries[origin] = (time.monotonic(), parser)
+        self._entries.move_to_end(origin)
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+        return parser
+
+robots_cache = RobotsCache(ROBOTS_CACHE_SIZE, ROBOTS_CACHE_TTL)
+
+def site_host(url: str) -> str:
+    host = url_host(url)
+    return host[4:] if host.startswith('www.') else host
+
+async def fetch_crawl_page(url: str, slots: asyncio.Semaphore, max_age: Optional[int] = None) -> Optional[PageExtraction]:
+    async with slots:
+        try:
+            return await fetch_and_parse(url, parse_website_details, max_age, stop_at=WEBSITE_STOP, stage='crawl')
+        except Exception as e:
+            logger.info(f"Error crawling {url}: {e}")
+            return None
+
+async def crawl_website(
+    website_url: str,
+    landing: PageExtraction,
+    known: Dict[str, Any],
+    max_age: Optional[int] = None,
+    limits: Optional[CrawlLimits] = None,
+) -> List[PageExtraction]:
+    """Follow contact and about links from a company's landing page.
 
-async def scrape_url(url: str) -> ScrapedData:
+    ``known`` holds the fields found so far. Each level fetches up to
+    CRAWL_CONCURRENCY pages at once and stops as soon as every target field
+    is filled. Pages are returned in link order, most promising first.
+    """
+    limits = limits or CrawlLimits()
+    base = website_base_url(website_url)
+    site = site_host(base)
+    seen = {normalize_url(base)}
+    frontier = [(base, href) for href in landing.data.pop('crawl_links', [])]
+    slots = asyncio.Semaphore(max(1, CRAWL_CONCURRENCY))
+    found = dict(known)
+    pages: List[PageExtraction] = []
+    fetched = 0
+    
+    def complete() -> bool:
+        return all(found.get(field) for field in CRAWL_TARGET_FIELDS)
+    
+    for _ in range(limits.depth):
+        budget = limits.pages - fetched
+        if complete() or budget <= 0:
+            break
+        candidates = []
+        for page_url, href in frontier:
+            url = urldefrag(urljoin(page_url, href))[0]
+            if urlsplit(url).scheme not in ('http', 'https') or site_host(url) != site:
+                continue
+            key = normalize_url(url)
+            if key in seen:
+                continue
+            seen.add(key)
+            if await robots_cache.allowed(url):
+                candidates.append(url)
+                if len(candidates) >= budget:
+                    break
+        if not candidates:
+            break
+        fetched += len(candidates)
+        
+        tasks = [asyncio.ensure_future(fetch_crawl_page(url, slots, max_age)) for url in candidates]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                page = await next_done
+                if page is not None:
+                    found = merge_extractions(found, page.data)
+                    if complete():
+                        break
+        finally:
+            for task in tasks:
+                task.cancel()
+        
+        frontier = []
+        for url, task in zip(candidates, tasks):
+            page = task.result() if task.done() and not task.cancelled() else None
+            if page is not None:
+                frontier.extend((url, href) for href in page.data.pop('crawl_links', []))
+                pages.append(page)
+    return pages
+
+def url_host(url: str) -> str:
+    """Return the lower-cased host name of a URL (scheme optional)"""
+    if not url.startswith('http'):
+        url = 'https://' + url
+    return (urlparse(url).hostname or '').lower()
+
+class _HostState:
+    def __init__(self, concurrency: int):
+        self.slots = asyncio.Semaphore(concurrency)
+        self.next_start = 0.0
+        self.active = 0
+
+class ScrapeScheduler:
+    """Run scrapes concurrently under a global cap while keeping every host polite.
+
+    At most ``concurrency`` URLs are scraped at once. Requests to a single host
+    are limited to ``per_host_concurrency`` at a time and their start times are
+    spaced at least ``per_host_delay`` seconds apart.
+    """
+
+    def __init__(self, concurrency: int, per_host_concurrency: int, per_host_delay: float):
+        self.concurrency = max(1, concurrency)
+        self.per_host_concurrency = max(1, per_host_concurrency)
+        self.per_host_delay = max(0.0, per_host_delay)
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._hosts: Dict[str, _HostState] = {}
+        self.active = 0
+        self.waiting = 0
+
+    @asynccontextmanager
+    async def host_slot(self, url: str):
+        """Hold a politeness slot for the host of ``url`` while fetching it"""
+        host = url_host(url)
+        state = self._hosts.get(host)
+        if state is None:
+            self._forget_idle_hosts()
+            state = self._hosts[host] = _HostState(self.per_host_concurrency)
+        state.active += 1
+        try:
+            async with state.slots:
+                loop = asyncio.get_running_loop()
+                now = loop.time()
+                start = max(now, state.next_start)
+                state.next_start = start + self.per_host_delay
+                if start > now:
+                    await asyncio.sleep(start - now)
+                yield
+        finally:
+            state.active -= 1
+
+    def _forget_idle_hosts(self):
+        """Drop hosts with no active fetches whose delay has already passed"""
+        if len(self._hosts) < 1024:
+            return
+        now = asyncio.get_running_loop().time()
+        for host in [h for h, st in self._hosts.items() if st.active == 0 and st.next_start <= now]:
+            del self._hosts[host]
+
+    async def run(
+        self, url: str, max_age: Optional[int] = None, crawl: Optional[CrawlLimits] = None, refresh: bool = False
+    ) -> "ScrapedData":
+        """Scrape a single URL inside the global concurrency cap"""
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        self.active += 1
+        try:
+            return await scrape_url(url, max_age, crawl, refresh)
+        finally:
+            self.active -= 1
+            self._slots.release()
+
+    async def map(self, urls: List[str], crawl: Optional[CrawlLimits] = None) -> List["ScrapedData"]:
+        """Scrape many URLs concurrently, returning results in input order"""
+        results: List[Optional[ScrapedData]] = [None] * len(urls)
+        pending = iter(enumerate(urls))
+
+        async def worker():
+            for index, url in pending:
+                try:
+                    results[index] = await self.run(url, crawl=crawl)
+                except CircuitOpenError as e:
+                    # Reported to the caller but not stored, like any deferred scrape
+                    results[index] = ScrapedData(
+                        source_url=url, normalized_url=normalize_url(url), status="failed", error_message=str(e)
+                    )
+
+        await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(urls)))))
+        return results
+
+scrape_scheduler = ScrapeScheduler(SCRAPE_CONCURRENCY, SCRAPE_PER_HOST_CONCURRENCY, SCRAPE_PER_HOST_DELAY)
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a URL used to recognise repeated scrapes of one page"""
+    url = url.strip()
+    if '://' not in url:
+        url = 'https://' + url
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and (scheme, parts.port) not in (('http', 80), ('https', 443)):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip('/') or '/'
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, path, query, ''))
+
+# Recent successful results by normalized URL, and scrapes currently running
+recent_results: "OrderedDict[str, Tuple[float, ScrapedData]]" = OrderedDict()
+inflight_scrapes: Dict[str, asyncio.Future] = {}
+
+def remember_result(result: ScrapedData):
+    recent_results[result.normalized_url] = (time.monotonic(), result)
+    recent_results.move_to_end(result.normalized_url)
+    while len(recent_results) > SCRAPE_RECENT_RESULTS:
+        recent_results.popitem(last=False)
+
+async def find_recent_result(normalized: str, freshness: int) -> Optional[ScrapedData]:
+    """Return a successful result for the URL scraped within ``freshness`` seconds"""
+    cached = recent_results.get(normalized)
+    if cached is not None:
+        scraped_at, result = cached
+        if time.monotonic() - scraped_at <= freshness:
+            return result
+        del recent_results[normalized]
+    
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=freshness)
+    doc = await db.scraped_data.find_one(
+        {
+            "normalized_url": normalized,
+            "status": {"$ne": "failed"},
+            "$or": [{"timestamp": {"$gte": cutoff}}, {"last_checked": {"$gte": cutoff}}],
+        },
+        {"_id": 0},
+        sort=[("timestamp", -1)],
+    )
+    if not doc:
+        return None
+    return ScrapedData(**doc)
+
+async def scrape_url(
+    url: str, max_age: Optional[int] = None, crawl: Optional[CrawlLimits] = None, refresh: bool = False
+) -> ScrapedData:
+    """Scrape a URL unless it was scraped successfully within the freshness window.
+
+    Concurrent calls for the same normalized URL share a single scrape, made
+    with the first caller's ``crawl`` limits. A ``max_age`` given by the
+    caller replaces the default freshness window. A failed ``refresh`` check
+    of a known target is not stored, only counted against the target.
+    """
+    normalized = normalize_url(url)
+    freshness = SCRAPE_FRESHNESS_SECONDS if max_age is None else max_age
+    if freshness > 0:
+        recent = await find_recent_result(normalized, freshness)
+        if recent is not None:
+            SCRAPES_TOTAL.labels('fresh').inc()
+            return recent
+    
+    task = inflight_scrapes.get(normalized)
+    if task is None:
+        task = asyncio.ensure_future(_scrape_url(url, normalized, max_age, crawl, refresh))
+        inflight_scrapes[normalized] = task
+        task.add_done_callback(lambda _: inflight_scrapes.pop(normalized, None))
+    else:
+        SCRAPES_TOTAL.labels('coalesced').inc()
+    # Shielded so that one caller going away does not cancel the shared scrape
+    return await asyncio.shield(task)
+
+def merge_extractions(startup_data: Dict[str, Any], *website_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Combine portal and website page extractions, preferring the earliest value"""
+    merged = dict(startup_data)
+    for data in website_data:
+        for key, value in data.items():
+            if not merged.get(key) and value:
+                merged[key] = value
+    return merged
+
+async def _scrape_url(
+    url: str, normalized: str, max_age: Optional[int] = None, crawl: Optional[CrawlLimits] = None, refresh: bool = False
+) -> ScrapedData:
     """Main scraping function"""
+    scrape_started = time.perf_counter()
     try:
         # First scrape the startup India page
-        startup_data = await asyncio.to_thread(scrape_startup_india_page, url)
+        startup = await scrape_startup_india_page(url, max_age)
         
-        # If website found, scrape additional details
-        if startup_data.get('website'):
-            website_data = await asyncio.to_thread(scrape_website_details, startup_data['website'])
-            # Merge data, preferring startup_data for conflicts
-            for key, value in website_data.items():
-                if not startup_data.get(key) and value:
-                    startup_data[key] = value
+        # If website found, scrape additional details from it and its contact pages
+        website = PageExtraction({})
+        crawled: List[PageExtraction] = []
+        if startup.data.get('website'):
+            website = await scrape_website_details(startup.data['website'], max_age)
+            known = merge_extractions(startup.data, website.data)
+            crawled = await crawl_website(startup.data['website'], website, known, max_age, crawl)
         
+        started = time.perf_counter()
+        pages = [('startup', startup), ('website', website)]
+        pages += [(f'website_{n}', page) for n, page in enumerate(crawled, 1)]
+        archive = {name: page.archive for name, page in pages if page.archive}
         scraped = ScrapedData(
             source_url=url,
-            **startup_data
+            normalized_url=normalized,
+            html_archive=archive or None,
+            **merge_extractions(startup.data, website.data, *(page.data for page in crawled))
         )
+        scraped.fingerprint = extraction_fingerprint(scraped.model_dump(include=set(EXTRACTED_FIELDS)))
+        observe_stage('merge', url, 'ok', started)
         
-        # Save to database
-        doc = scraped.model_dump()
-        doc['timestamp'] = doc['timestamp'].isoformat()
-        await db.scraped_data.insert_one(doc)
+        # Save to database, unless it is what was last stored for the URL
+        target = await db.scrape_targets.find_one({"normalized_url": normalized}, {"_id": 0})
+        unchanged = None
+        if target and target.get("fingerprint") == scraped.fingerprint:
+            unchanged = await touch_unchanged_result(target["result_id"], scraped.timestamp)
+        if unchanged is not None:
+            scraped = unchanged
+        else:
+            scraped.last_checked = scraped.last_changed = scraped.timestamp
+            result_writer.add(scraped.model_dump())
+        await record_target_check(url, normalized, target, scraped, changed=unchanged is None)
+        remember_result(scraped)
         
+        SCRAPES_TOTAL.labels(scraped.status).inc()
+        SCRAPE_SECONDS.labels(scraped.status).observe(time.perf_counter() - scrape_started)
         return scraped
+    except CircuitOpenError:
+        # Says nothing about the page, so nothing is stored; callers retry later
+        SCRAPES_TOTAL.labels('deferred').inc()
+        raise
     except Exception as e:
         logger.error(f"Error in scrape_url: {e}")
         error_data = ScrapedData(
             source_url=url,
+            normalized_url=normalized,
             status="failed",
             error_message=str(e)
         )
-        doc = error_data.model_dump()
-        doc['timestamp'] = doc['timestamp'].isoformat()
-        await db.scraped_data.insert_one(doc)
+        known = await record_target_failure(normalized)
+        if not (refresh and known):
+            result_writer.add(error_data.model_dump())
+        SCRAPES_TOTAL.labels('failed').inc()
+        SCRAPE_SECONDS.labels('failed').observe(time.perf_counter() - scrape_started)
         return error_data
 
+# Buffered result writes
+class ResultWriter:
+    """Write-behind buffer for scraped_data inserts.
+
+    Results are collected and written with one unordered ``insert_many`` once
+    ``batch_size`` documents are waiting or every ``interval`` seconds. Until
+    its batch is written a result can still be read with ``get``, and callers
+    that need it in Mongo wait on ``wait_persisted``.
+
+    Every write runs as its own task, so cancelling a caller (or ``run`` at
+    shutdown) never interrupts a batch that has left the buffer; ``close``
+    waits for those writes.
+    """
+
+    def __init__(self, batch_size: int, interval: float):
+        self.batch_size = max(1, batch_size)
+        self.interval = max(0.01, interval)
+        self._buffer: List[Dict[str, Any]] = []
+        self._pending: Dict[str, Tuple[Dict[str, Any], asyncio.Future]] = {}
+        self._lock = asyncio.Lock()
+        self._flush_tasks: set = set()
+        self.flushes = 0
+        self.documents = 0
+        self.errors = 0
+        self.last_batch_size = 0
+        self.max_batch_size = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+
+    def add(self, doc: Dict[str, Any]):
+        """Queue a document, starting a flush when the batch is full"""
+        future = asyncio.get_running_loop().create_future()
+        self._buffer.append(doc)
+        self._pending[doc["id"]] = (doc, future)
+        if len(self._buffer) >= self.batch_size:
+            self._start_flush()
+
+    def get(self, result_id: str) -> Optional[Dict[str, Any]]:
+        """Return a result that is buffered or being written, if any"""
+        entry = self._pending.get(result_id)
+        if entry is None:
+            return None
+        return {k: v for k, v in entry[0].items() if k != "_id"}
+
+    async def wait_persisted(self, result_ids: List[str], flush: bool = False):
+        """Wait until the given results are in Mongo, optionally flushing right away"""
+        futures = [self._pending[rid][1] for rid in result_ids if rid in self._pending]
+        if not futures:
+            return
+        if flush:
+            await self.flush()
+        for future in futures:
+            await asyncio.shield(future)
+
+    def _start_flush(self) -> asyncio.Task:
+        task = asyncio.create_task(self._flush())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+        return task
+
+    async def flush(self):
+        """Write everything buffered so far in one batch"""
+        await asyncio.shield(self._start_flush())
+
+    async def _flush(self):
+        async with self._lock:
+            if not self._buffer:
+                return
+            docs, self._buffer = self._buffer, []
+            started = time.perf_counter()
+            failed: Dict[int, Exception] = {}
+            requeued = False
+            try:
+                await db.scraped_data.insert_many(docs, ordered=False)
+            except BulkWriteError as e:
+                # Unordered: every document without a write error was inserted. A
+                # duplicate id means an interrupted earlier attempt already stored it.
+                for error in e.details.get("writeErrors", []):
+                    if error.get("code") != 11000:
+                        failed[error["index"]] = Exception(error.get("errmsg", "write error"))
+                if failed:
+                    logger.error(f"Error writing {len(failed)} of {len(docs)} results: {e}")
+            except asyncio.CancelledError:
+                # Put the batch back for the next flush; its futures stay pending
+                self._buffer[:0] = docs
+                requeued = True
+                raise
+            except Exception as e:
+                failed = {index: e for index in range(len(docs))}
+                logger.error(f"Error writing {len(docs)} results: {e}")
+            finally:
+                if not requeued:
+                    self._finish_batch(docs, failed, started)
+
+    def _finish_batch(self, docs: List[Dict[str, Any]], failed: Dict[int, Exception], started: float):
+        """Record a written batch and resolve or fail each of its futures"""
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        FLUSH_SECONDS.observe(elapsed_ms / 1000)
+        FLUSH_BATCH_SIZE.observe(len(docs))
+        self.flushes += 1
+        self.documents += len(docs) - len(failed)
+        self.errors += len(failed)
+        self.last_batch_size = len(docs)
+        self.max_batch_size = max(self.max_batch_size, len(docs))
+        self.last_flush_ms = elapsed_ms
+        self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+        self._total_flush_ms += elapsed_ms
+        
+        for index, doc in enumerate(docs):
+            _, future = self._pending.pop(doc["id"])
+            if index in failed:
+                future.set_exception(failed[index])
+                future.exception()  # Nobody may be waiting; don't warn about it
+            else:
+                future.set_result(None)
+
+    async def run(self):
+        """Flush the buffer every ``interval`` seconds until cancelled"""
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+    async def close(self):
+        """Finish in-progress flushes and write whatever is left"""
+        await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+        await self._flush()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "flushes": self.flushes,
+            "documents": self.documents,
+            "errors": self.errors,
+            "pending": len(self._pending),
+            "batch_size_limit": self.batch_size,
+            "last_batch_size": self.last_batch_size,
+            "max_batch_size": self.max_batch_size,
+            "avg_batch_size": round((self.documents + self.errors) / self.flushes, 2) if self.flushes else 0,
+            "last_flush_ms": round(self.last_flush_ms, 2),
+            "max_flush_ms": round(self.max_flush_ms, 2),
+            "avg_flush_ms": round(self._total_flush_ms / self.flushes, 2) if self.flushes else 0,
+        }
+
+result_writer = ResultWriter(RESULT_WRITE_BATCH_SIZE, RESULT_WRITE_INTERVAL)
+
+# Database indexes and migrations
+DATETIME_FIELDS = {
+    "scraped_data": ["timestamp"],
+    "api_keys": ["created_at", "last_used"],
+    "scrape_jobs": ["created_at", "updated_at", "finished_at"],
+}
+
+async def ensure_indexes():
+    """Create the indexes used by result listing, deduplication and key lookups"""
+    await db.scraped_data.create_index([("timestamp", -1), ("id", -1)])
+    for field in RESULT_FILTER_FIELDS:
+        await db.scraped_data.create_index([(field, 1), ("timestamp", -1), ("id", -1)])
+    await db.scraped_data.create_index("id", unique=True)
+    await db.scraped_data.create_index("source_url")
+    await db.scraped_data.create_index([("normalized_url", 1), ("timestamp", -1)])
+    await db.scrape_targets.create_index("normalized_url", unique=True)
+    await db.scrape_targets.create_index("next_check_at")
+    await db.scrape_targets.create_index("refresh_claim", sparse=True)
+    await db.scrape_targets.create_index("result_id")
+    await db.api_keys.create_index("key", unique=True)
+    await db.api_keys.create_index("id", unique=True)
+    await db.api_keys.create_index("deactivated_at", sparse=True)
+    if RATE_LIMIT_BACKEND == "mongo":
+        await ensure_rate_limit_indexes()
+    await ensure_job_indexes()
+
+async def migrate_string_timestamps(batch_size: int = 1000):
+    """One-off conversion of ISO-string dates written by older versions to BSON dates.
+
+    A value that does not parse is kept under ``<field>_unparsed`` and replaced
+    with the creation time of the document's ObjectId, so required date fields
+    stay valid.
+    """
+    for collection, fields in DATETIME_FIELDS.items():
+        for field in fields:
+            converted = 0
+            while True:
+                docs = await db[collection].find(
+                    {field: {"$type": "string"}}, {"_id": 1, field: 1}
+                ).limit(batch_size).to_list(batch_size)
+                if not docs:
+                    break
+                updates = []
+                for doc in docs:
+                    try:
+                        update = {field: datetime.fromisoformat(doc[field])}
+                    except ValueError:
+                        logger.warning(f"Moving unparseable {collection}.{field} aside: {doc[field]!r}")
+                        created = doc["_id"].generation_time if isinstance(doc["_id"], ObjectId) else datetime.now(timezone.utc)
+                        update = {field: created, f"{field}_unparsed": doc[field]}
+                    updates.append(UpdateOne({"_id": doc["_id"]}, {"$set": update}))
+                await db[collection].bulk_write(updates, ordered=False)
+                converted += len(docs)
+            if converted:
+                logger.info(f"Converted {converted} string {collection}.{field} values to dates")
+
+async def run_startup_migrations():
+    try:
+        await migrate_string_timestamps()
+    except Exception as e:
+        logger.error(f"Error migrating string timestamps: {e}")
+
+# Background scrape jobs
+#
+# Every URL of a job is a document in scrape_job_items. Any API replica or
+# standalone worker (worker.py) claims items with an atomic lease, keeps the
+# lease alive with heartbeats while scraping, and marks the item done. Items
+# whose lease expired (dead worker) are claimed again by someone else.
+work_available = asyncio.Event()
+held_leases: set = set()
+background_tasks: List[asyncio.Task] = []
+job_completions: set = set()
+csv_ingests: set = set()
+job_listeners: Dict[str, set] = {}  # job id -> events of local progress streams
+
+async def ensure_job_indexes():
+    """Create the indexes used for claiming and reading job items"""
+    await db.scrape_job_items.create_index([("status", 1), ("_id", 1)])
+    await db.scrape_job_items.create_index([("status", 1), ("lease_expires_at", 1)])
+    await db.scrape_job_items.create_index([("job_id", 1), ("status", 1), ("index", 1)])
+    await db.scrape_job_items.create_index([("job_id", 1), ("event_seq", 1)], sparse=True)
+
+async def insert_job_items(
+    job_id: str, urls: List[str], start: int, crawl: Optional[CrawlLimits] = None, refresh: bool = False
+):
+    extra = {"crawl": crawl._asdict()} if crawl is not None else {}
+    if refresh:
+        extra["refresh"] = True
+    for offset in range(0, len(urls), JOB_ITEM_BATCH_SIZE):
+        await db.scrape_job_items.insert_many([
+            {"job_id": job_id, "index": index, "url": url, "status": "pending", "attempts": 0, **extra}
+            for index, url in enumerate(urls[offset:offset + JOB_ITEM_BATCH_SIZE], start + offset)
+        ])
+
+async def submit_scrape_job(urls: List[str], source: str = "bulk", crawl: Optional[CrawlLimits] = None) -> ScrapeJob:
+    """Store a job and its URLs so that any worker can start claiming them"""
+    job = ScrapeJob(source=source, total=len(urls))
+    await db.scrape_jobs.insert_one(job.model_dump())
+    await insert_job_items(job.id, urls, 0, crawl, refresh=source == "refresh")
+    work_available.set()
+    return job
+
+async def start_scrape_job(source: str) -> ScrapeJob:
+    """Store an empty job that URLs are added to with extend_scrape_job"""
+    job = ScrapeJob(source=source, ingesting=True)
+    await db.scrape_jobs.insert_one(job.model_dump())
+    return job
+
+async def extend_scrape_job(job_id: str, urls: List[str], start: int) -> bool:
+    """Append URLs to a job being ingested; returns False once the job was cancelled"""
+    job = await db.scrape_jobs.find_one_and_update(
+        {"id": job_id, "status": {"$in": ["queued", "running"]}},
+        {"$inc": {"total": len(urls)}, "$set": {"updated_at": datetime.now(timezone.utc)}},
+    )
+    if job is None:
+        return False
+    await insert_job_items(job_id, urls, start)
+    work_available.set()
+    return True
+
+async def finish_scrape_job_ingest(job_id: str, csv_summary: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Mark ingestion done, completing the job if workers already caught up"""
+    now = datetime.now(timezone.utc)
+    update = {"ingesting": False, "updated_at": now}
+    if csv_summary is not None:
+        update["csv"] = csv_summary
+    await db.scrape_jobs.update_one({"id": job_id}, {"$set": update})
+    await db.scrape_jobs.update_one(
+        {"id": job_id, "status": {"$in": ["queued", "running"]}, "$expr": {"$gte": ["$processed", "$total"]}},
+        {"$set": {"status": "completed", "finished_at": now}}
+    )
+    return await db.scrape_jobs.find_one({"id": job_id}, {"_id": 0})
+
+async def claim_job_item() -> Optional[Dict[str, Any]]:
+    """Atomically lease the oldest pending item that is not deferred, or one whose lease has expired"""
+    now = datetime.now(timezone.utc)
+    lease = {
+        "$set": {
+            "status": "leased",
+            "lease_owner": WORKER_ID,
+            "lease_expires_at": now + timedelta(seconds=JOB_LEASE_SECONDS),
+        },
+        "$inc": {"attempts": 1},
+    }
+    item = await db.scrape_job_items.find_one_and_update(
+        {"status": "pending", "not_before": {"$not": {"$gt": now}}}, lease, sort=[("_id", 1)], return_document=ReturnDocument.AFTER
+    )
+    if item is None:
+        item = await db.scrape_job_items.find_one_and_update(
+            {"status": "leased", "lease_expires_at": {"$lt": now}}, lease,
+            sort=[("lease_expires_at", 1)], return_document=ReturnDocument.AFTER
+        )
+        if item is not None:
+            logger.info(f"Reclaimed expired lease on {item['url']} (attempt {item['attempts']})")
+    return item
+
+async def complete_job_item(item: Dict[str, Any], result: ScrapedData):
+    """Record an item's result and update its job's counters"""
+    updated = await db.scrape_job_items.update_one(
+        {"_id": item["_id"], "status": "leased", "lease_owner": WORKER_ID},
+        {
+            "$set": {"status": "done", "result_id": result.id, "result_status": result.status},
+            "$unset": {"lease_owner": "", "lease_expires_at": ""},
+        }
+    )
+    if updated.modified_count == 0:
+        return  # Lease was lost to another worker, which will report the item
+    
+    failed = result.status == "failed"
+    now = datetime.now(timezone.utc)
+    job = await db.scrape_jobs.find_one_and_update(
+        {"id": item["job_id"]},
+        {
+            "$inc": {"processed": 1, "failed": int(failed), "succeeded": int(not failed)},
+            "$set": {"updated_at": now},
+        },
+        return_document=ReturnDocument.AFTER,
+    )
+    if job is None:
+        return
+    # The processed count is a dense per-job sequence number for progress streams
+    await db.scrape_job_items.update_one({"_id": item["_id"]}, {"$set": {"event_seq": job["processed"]}})
+    if job["status"] in ("queued", "running") and not job.get("ingesting") and job["processed"] >= job["total"]:
+        await db.scrape_jobs.update_one(
+            {"id": job["id"], "status": {"$in": ["queued", "running"]}},
+            {"$set": {"status": "completed", "finished_at": now}}
+        )
+    notify_job_listeners(job["id"])
+
+def notify_job_listeners(job_id: str):
+    """Wake this process's progress streams for a job"""
+    for listener in job_listeners.get(job_id, ()):
+        listener.set()
+
+async def process_job_item(item: Dict[str, Any]):
+    """Scrape a claimed item while holding its lease"""
+    held_leases.add(item["_id"])
+    try:
+        if item["index"] == 0 and item["attempts"] == 1:
+            await db.scrape_jobs.update_one(
+                {"id": item["job_id"], "status": "queued"},
+                {"$set": {"status": "running", "updated_at": datetime.now(timezone.utc)}}
+            )
+        crawl = CrawlLimits(**item["crawl"]) if item.get("crawl") else None
+        result = await scrape_scheduler.run(item['url'], crawl=crawl, refresh=item.get("refresh", False))
+    except CircuitOpenError as e:
+        held_leases.discard(item["_id"])
+        await defer_job_item(item, e.retry_in)
+        return
+    except BaseException:
+        held_leases.discard(item["_id"])
+        raise
+    # The item is completed once its result has been written; meanwhile this
+    # worker moves on to the next item and the lease stays alive.
+    task = asyncio.create_task(finish_job_item(item, result))
+    job_completions.add(task)
+    task.add_done_callback(job_completions.discard)
+
+async def defer_job_item(item: Dict[str, Any], delay: float):
+    """Put a leased item back as pending, not to be claimed for ``delay`` seconds"""
+    await db.scrape_job_items.update_one(
+        {"_id": item["_id"], "status": "leased", "lease_owner": WORKER_ID},
+        {
+            "$set": {"status": "pending", "not_before": datetime.now(timezone.utc) + timedelta(seconds=delay)},
+            "$unset": {"lease_owner": "", "lease_expires_at": ""},
+            "$inc": {"attempts": -1},  # Nothing was fetched, so this does not count as an attempt
+        }
+    )
+    logger.info(f"Deferred {item['url']} for {delay:.0f}s while its host's circuit is open")
+
+async def finish_job_item(item: Dict[str, Any], result: ScrapedData):
+    """Complete an item after its result is persisted, keeping the lease until then"""
+    try:
+        await result_writer.wait_persisted([result.id])
+        await complete_job_item(item, result)
+    except Exception as e:
+        # The lease runs out and the item is scraped again
+        logger.error(f"Error completing job item {item['url']}: {e}")
+    finally:
+        held_leases.discard(item["_id"])
+
+async def job_item_worker():
+    """Claim and process job items until cancelled, idling when there is no work"""
+    while True:
+        try:
+            item = await claim_job_item()
+        except Exception as e:
+            logger.error(f"Error claiming job item: {e}")
+            item = None
+        
+        if item is None:
+            work_available.clear()
+            try:
+                await asyncio.wait_for(work_available.wait(), timeout=JOB_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            continue
+        
+        try:
+            await process_job_item(item)
+        except Exception as e:
+            logger.error(f"Error processing job item {item['url']}: {e}")
+
+async def job_lease_heartbeat():
+    """Periodically extend the leases held by this worker"""
+    while True:
+        await asyncio.sleep(JOB_HEARTBEAT_SECONDS)
+        if not held_leases:
+            continue
+        try:
+            await db.scrape_job_items.update_many(
+                {"_id": {"$in": list(held_leases)}, "lease_owner": WORKER_ID},
+                {"$set": {"lease_expires_at": datetime.now(timezone.utc) + timedelta(seconds=JOB_LEASE_SECONDS)}}
+            )
+        except Exception as e:
+            logger.error(f"Error renewing job item leases: {e}")
+
+def start_job_workers(count: int) -> List[asyncio.Task]:
+    """Start ``count`` item workers plus the lease heartbeat"""
+    tasks = [asyncio.create_task(job_item_worker()) for _ in range(count)]
+    tasks.append(asyncio.create_task(job_lease_heartbeat()))
+    return tasks
+
+# Incremental refresh
+#
+# scrape_targets holds one document per scraped URL with the fingerprint and
+# id of its latest stored result. A check that finds the same fingerprint only
+# stamps last_checked on that result instead of storing a new one, and the
+# target's check interval adapts to how often its content actually changes.
+def extraction_fingerprint(data: Dict[str, Any]) -> str:
+    """Hash of a result's extracted fields, ignoring when and how it was fetched"""
+    fields = {field: data.get(field) for field in EXTRACTED_FIELDS}
+    return hashlib.sha256(json.dumps(fields, sort_keys=True).encode('utf-8')).hexdigest()
+
+def next_refresh_interval(target: Optional[Dict[str, Any]], changed: bool) -> float:
+    if target is None:
+        return REFRESH_INITIAL_INTERVAL
+    interval = target.get("interval", REFRESH_INITIAL_INTERVAL)
+    interval = interval / 2 if changed else interval * REFRESH_INTERVAL_GROWTH
+    return min(REFRESH_MAX_INTERVAL, max(REFRESH_MIN_INTERVAL, interval))
+
+def refresh_due_at(now: datetime, interval: float) -> datetime:
+    # +/-10% jitter keeps targets first scraped together from staying in lockstep
+    return now + timedelta(seconds=interval * random.uniform(0.9, 1.1))
+
+async def touch_unchanged_result(result_id: str, checked_at: datetime) -> Optional[ScrapedData]:
+    """Stamp a re-check on the stored result; None if it no longer exists"""
+    await result_writer.wait_persisted([result_id])
+    doc = await db.scraped_data.find_one_and_update(
+        {"id": result_id},
+        {"$set": {"last_checked": checked_at}},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER,
+    )
+    return ScrapedData(**doc) if doc else None
+
+async def record_target_check(url: str, normalized: str, target: Optional[Dict[str, Any]], result: ScrapedData, changed: bool):
+    """Record a successful check and schedule the target's next one"""
+    interval = next_refresh_interval(target, changed)
+    now = result.last_checked
+    update = {
+        "$set": {
+            "url": url,
+            "fingerprint": result.fingerprint,
+            "result_id": result.id,
+            "interval": interval,
+            "last_checked": now,
+            "next_check_at": refresh_due_at(now, interval),
+            "failures": 0,
+        },
+        "$unset": {"refresh_claim": "", "parked_at": ""},
+        "$inc": {"checks": 1, "changes": int(changed)},
+    }
+    if changed:
+        update["$set"]["last_changed"] = now
+    try:
+        await db.scrape_targets.update_one({"normalized_url": normalized}, update, upsert=True)
+    except Exception as e:
+        logger.error(f"Error recording check of {url}: {e}")
+
+def failure_backoff(failures: int) -> float:
+    """Seconds before retrying a target that failed ``failures`` checks in a row"""
+    return min(REFRESH_MAX_INTERVAL, REFRESH_MIN_INTERVAL * 2 ** (failures - 1))
+
+async def record_target_failure(normalized: str) -> bool:
+    """Back a known target off after a failed check; returns whether the URL is a target.
+
+    Each failure in a row doubles the wait, leaving the content interval alone.
+    After REFRESH_MAX_FAILURES the target is parked until a scrape succeeds.
+    """
+    try:
+        target = await db.scrape_targets.find_one({"normalized_url": normalized}, {"_id": 0, "failures": 1})
+        if target is None:
+            return False
+        now = datetime.now(timezone.utc)
+        failures = target.get("failures", 0) + 1
+        update = {"$set": {"failures": failures}, "$unset": {"refresh_claim": ""}}
+        if REFRESH_MAX_FAILURES and failures >= REFRESH_MAX_FAILURES:
+            update["$set"]["parked_at"] = now
+            update["$unset"]["next_check_at"] = ""
+            logger.warning(f"Parked refresh target {normalized} after {failures} failed checks")
+        else:
+            update["$set"]["next_check_at"] = refresh_due_at(now, failure_backoff(failures))
+        await db.scrape_targets.update_one({"normalized_url": normalized}, update)
+        return True
+    except Exception as e:
+        logger.error(f"Error recording failed check of {normalized}: {e}")
+        return False
+
+async def queue_due_refreshes() -> Optional[ScrapeJob]:
+    """Claim up to REFRESH_BATCH_SIZE due targets and queue them as a refresh job"""
+    now = datetime.now(timezone.utc)
+    due = await db.scrape_targets.find(
+        {"next_check_at": {"$lte": now}}, {"_id": 1}
+    ).sort("next_check_at", 1).limit(REFRESH_BATCH_SIZE).to_list(REFRESH_BATCH_SIZE)
+    if not due:
+        return None
+    # Claimed by token, so replicas polling at the same time queue disjoint sets
+    claim = uuid.uuid4().hex
+    await db.scrape_targets.update_many(
+        {"_id": {"$in": [doc["_id"] for doc in due]}, "next_check_at": {"$lte": now}},
+        {"$set": {"refresh_claim": claim, "next_check_at": now + timedelta(seconds=REFRESH_REQUEUE_AFTER)}},
+    )
+    claimed = await db.scrape_targets.find({"refresh_claim": claim}, {"_id": 0, "url": 1}).to_list(None)
+    if not claimed:
+        return None
+    job = await submit_scrape_job([doc["url"] for doc in claimed], source="refresh")
+    logger.info(f"Queued {len(claimed)} due refreshes as job {job.id}")
+    return job
+
+async def refresh_scheduler():
+    """Queue due refresh targets every REFRESH_POLL_INTERVAL seconds"""
+    while True:
+        try:
+            while await queue_due_refreshes() is not None:
+                pass
+        except Exception as e:
+            logger.error(f"Error queueing refreshes: {e}")
+        await asyncio.sleep(REFRESH_POLL_INTERVAL)
+
+# API key cache
+#
+# Validated keys are kept in memory for API_KEY_CACHE_TTL seconds. Deactivation
+# stamps deactivated_at, which every replica polls for to evict the key early.
+# last_used is rolled up per key and written in one bulk write per interval.
+class APIKeyCache:
+    """LRU of validated API key documents, each trusted for ``ttl`` seconds"""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max(1, max_size)
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, doc = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return doc
+
+    def put(self, key: str, doc: Dict[str, Any]):
+        if self.ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, doc)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def discard_ids(self, key_ids):
+        """Evict the keys with the given document ids"""
+        key_ids = set(key_ids)
+        for key in [k for k, (_, doc) in self._entries.items() if doc["id"] in key_ids]:
+            del self._entries[key]
+
+api_key_cache = APIKeyCache(API_KEY_CACHE_SIZE, API_KEY_CACHE_TTL)
+api_key_last_used: Dict[str, datetime] = {}
+
+async def flush_api_key_usage():
+    """Write the rolled-up last_used timestamps with a single bulk write"""
+    if not api_key_last_used:
+        return
+    pending = dict(api_key_last_used)
+    api_key_last_used.clear()
+    try:
+        await db.api_keys.bulk_write(
+            [UpdateOne({"id": key_id}, {"$max": {"last_used": used}}) for key_id, used in pending.items()],
+            ordered=False,
+        )
+    except Exception as e:
+        logger.error(f"Error writing API key usage: {e}")
+        for key_id, used in pending.items():
+            api_key_last_used[key_id] = max(used, api_key_last_used.get(key_id, used))
+
+async def api_key_usage_flusher():
+    """Flush API key usage every API_KEY_USAGE_FLUSH_INTERVAL seconds"""
+    while True:
+        await asyncio.sleep(API_KEY_USAGE_FLUSH_INTERVAL)
+        await flush_api_key_usage()
+
+async def api_key_revocation_watcher():
+    """Evict keys deactivated on any replica since the previous poll"""
+    # Successive polls overlap by one interval so that writes racing a query aren't missed
+    since = datetime.now(timezone.utc) - timedelta(seconds=API_KEY_REVOCATION_POLL)
+    while True:
+        await asyncio.sleep(API_KEY_REVOCATION_POLL)
+        polled_at = datetime.now(timezone.utc) - timedelta(seconds=API_KEY_REVOCATION_POLL)
+        try:
+            revoked = await db.api_keys.find({"deactivated_at": {"$gte": since}}, {"_id": 0, "id": 1}).to_list(None)
+        except Exception as e:
+            logger.error(f"Error polling API key revocations: {e}")
+            continue
+        api_key_cache.discard_ids(doc["id"] for doc in revoked)
+        since = polled_at
+
 # API Key verification
 async def verify_api_key(authorization: Optional[str] = Header(None)):
     """Verify API key from Authorization header"""
@@ -287,21 +2141,543 @@ async def verify_api_key(authorization: Optional[str] = Header(None)):
     api_key = authorization.replace("Bearer ", "")
     
     # Check if key exists and is active
-    key_doc = await db.api_keys.find_one({"key": api_key, "is_active": True}, {"_id": 0})
-    if not key_doc:
+    key_doc = api_key_cache.get(api_key)
+    if key_doc is None:
+        key_doc = await db.api_keys.find_one({"key": api_key, "is_active": True}, {"_id": 0})
+        if not key_doc:
+            raise HTTPException(
+                status_code=401, 
+                detail="Invalid or inactive API key",
+                headers={"WWW-Authenticate": "Bearer"}
+            )
+        api_key_cache.put(api_key, key_doc)
+    
+    # Record last used timestamp; written by api_key_usage_flusher
+    api_key_last_used[key_doc["id"]] = datetime.now(timezone.utc)
+    
+    return key_doc
+
+# Rate limiting
+#
+# Each API key owns a token bucket holding up to ``burst`` tokens and refilled
+# at ``rate`` tokens per second. A request spends one token per URL it scrapes
+# and is refused with 429 and Retry-After when the bucket runs short. A request
+# costing more than ``burst`` goes through once the bucket is full and leaves
+# it in debt, which later requests wait out.
+class TokenBucketLimiter:
+    """Token buckets kept in this process"""
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def acquire(self, key_id: str, rate: float, burst: int, cost: int = 1) -> float:
+        """Spend ``cost`` tokens, returning 0 or the seconds until they are available"""
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key_id, (burst, now))
+        tokens = min(burst, tokens + (now - updated) * rate)
+        needed = min(cost, burst)
+        retry_after = 0.0
+        if tokens >= needed:
+            tokens -= cost
+        else:
+            retry_after = (needed - tokens) / rate
+        self._buckets[key_id] = (tokens, now)
+        self._buckets.move_to_end(key_id)
+        # The least recently used buckets have had the longest to refill
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+class MongoTokenBucketLimiter:
+    """Token buckets in the rate_limits collection, shared by every replica.
+
+    Refill and spend happen in one pipeline update against the database clock,
+    so concurrent requests on different replicas can't overspend a bucket.
+    """
+
+    async def acquire(self, key_id: str, rate: float, burst: int, cost: int = 1) -> float:
+        refilled = {"$min": [burst, {"$add": [
+            {"$ifNull": ["$tokens", burst]},
+            {"$multiply": [rate, {"$divide": [{"$subtract": ["$$NOW", {"$ifNull": ["$updated_at", "$$NOW"]}]}, 1000]}]},
+        ]}]}
+        bucket = await db.rate_limits.find_one_and_update(
+            {"_id": key_id},
+            [
+                {"$set": {"tokens": refilled, "updated_at": "$$NOW"}},
+                {"$set": {"allowed": {"$gte": ["$tokens", min(cost, burst)]}}},
+                {"$set": {"tokens": {"$cond": ["$allowed", {"$subtract": ["$tokens", cost]}, "$tokens"]}}},
+            ],
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        if bucket["allowed"]:
+            return 0.0
+        return (min(cost, burst) - bucket["tokens"]) / rate
+
+async def ensure_rate_limit_indexes():
+    """Expire shared buckets that have been idle for a day (long since refilled)"""
+    await db.rate_limits.create_index("updated_at", expireAfterSeconds=86400)
+
+rate_limiter = MongoTokenBucketLimiter() if RATE_LIMIT_BACKEND == "mongo" else TokenBucketLimiter()
+
+async def enforce_rate_limit(key_doc: Dict[str, Any], cost: int = 1):
+    """Charge ``cost`` tokens to the key's bucket or raise 429"""
+    rate = key_doc.get("rate_limit") or RATE_LIMIT_RATE
+    burst = key_doc.get("burst") or RATE_LIMIT_BURST
+    try:
+        retry_after = await rate_limiter.acquire(key_doc["id"], rate, burst, cost)
+    except Exception as e:
+        logger.error(f"Error checking rate limit, allowing request: {e}")
+        return
+    if retry_after > 0:
         raise HTTPException(
-            status_code=401, 
-            detail="Invalid or inactive API key",
-            headers={"WWW-Authenticate": "Bearer"}
+            status_code=429,
+            detail="Rate limit exceeded",
+            headers={"Retry-After": str(math.ceil(retry_after))}
         )
+
+# Job progress streams
+#
+# Every completed item carries an event_seq (1, 2, 3, ... per job) that doubles
+# as the SSE event id. Streams read items in event_seq order straight from
+# Mongo, so they see progress made by any replica and resume after
+# Last-Event-ID. Items are only read as fast as the client consumes events.
+def sse_event(event: str, data: Dict[str, Any], event_id: Optional[int] = None) -> str:
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data, default=_json_default)}")
+    return "\n".join(lines) + "\n\n"
+
+async def iter_job_events(job_id: str, last_seq: int = 0) -> AsyncIterator[str]:
+    """Stream item outcomes and counters of a job until it finishes"""
+    loop = asyncio.get_running_loop()
+    listener = asyncio.Event()
+    job_listeners.setdefault(job_id, set()).add(listener)
+    next_seq = last_seq + 1
+    last_progress = None
+    gap_since = None
+    last_sent = loop.time()
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            listener.clear()
+            job = await db.scrape_jobs.find_one({"id": job_id}, {"_id": 0})
+            if job is None:
+                return
+            items = await db.scrape_job_items.find(
+                {"job_id": job_id, "event_seq": {"$gte": next_seq}},
+                {"_id": 0, "event_seq": 1, "index": 1, "url": 1, "result_id": 1, "result_status": 1},
+            ).sort("event_seq", 1).limit(JOB_EVENT_BATCH_SIZE).to_list(JOB_EVENT_BATCH_SIZE)
+            
+            ready = []
+            for item in items:
+                if item["event_seq"] != next_seq + len(ready):
+                    break
+                ready.append(item)
+            if ready or not items:
+                gap_since = None
+            elif gap_since is None:
+                gap_since = loop.time()
+            elif loop.time() - gap_since > JOB_EVENT_GAP_TIMEOUT:
+                # A worker died between counting the item and numbering it
+                next_seq, gap_since = items[0]["event_seq"], None
+                continue
+            
+            if ready:
+                result_ids = [item["result_id"] for item in ready]
+                results = await db.scraped_data.find({"id": {"$in": result_ids}}, {"_id": 0}).to_list(len(result_ids))
+                by_id = {result["id"]: result for result in results}
+                for item in ready:
+                    item["result"] = by_id.get(item["result_id"])
+                    yield sse_event("item", item, item["event_seq"])
+                next_seq = ready[-1]["event_seq"] + 1
+                last_sent = loop.time()
+            
+            progress = {k: job.get(k) for k in ("status", "total", "processed", "succeeded", "failed", "ingesting")}
+            if progress != last_progress:
+                yield sse_event("progress", progress)
+                last_progress, last_sent = progress, loop.time()
+            
+            if job["status"] in ("completed", "cancelled") and next_seq > job["processed"]:
+                yield sse_event("end", progress)
+                return
+            if len(ready) == JOB_EVENT_BATCH_SIZE:
+                continue  # Backlog left; the client has already taken this batch
+            
+            try:
+                await asyncio.wait_for(listener.wait(), timeout=JOB_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            if loop.time() - last_sent >= JOB_EVENT_KEEPALIVE:
+                yield ": keepalive\n\n"
+                last_sent = loop.time()
+    finally:
+        listeners = job_listeners.get(job_id)
+        if listeners is not None:
+            listeners.discard(listener)
+            if not listeners:
+                del job_listeners[job_id]
+
+# CSV upload ingestion
+def validate_scrape_url(url: str) -> Optional[str]:
+    """Return the normalized form of a scrapeable URL, or None"""
+    if not url or len(url) > 2048 or any(c.isspace() for c in url):
+        return None
+    try:
+        normalized = normalize_url(url)
+    except ValueError:  # e.g. a non-numeric port
+        return None
+    parts = urlsplit(normalized)
+    host = parts.hostname or ''
+    if parts.scheme not in ('http', 'https') or not ('.' in host or ':' in host or host == 'localhost'):
+        return None
+    return normalized
+
+class CSVURLReader:
+    """Pull validated, de-duplicated URLs out of an uploaded CSV a batch at a time.
+
+    ``read_batch`` does blocking file reads and is meant to run in a worker
+    thread, so only the finished batches reach the event loop. Duplicates are
+    recognised by an 8-byte digest of the normalized URL to keep the seen-set
+    small for files with millions of rows.
+    """
+
+    MAX_INVALID_SAMPLES = 20
+
+    def __init__(self, stream, url_column: Optional[str] = None):
+        self._reader = csv.reader(io.TextIOWrapper(stream, encoding='utf-8-sig', newline=''))
+        self._url_column = url_column
+        self._index: Optional[int] = None
+        self._leading_rows: List[List[str]] = []
+        self._seen: set = set()
+        self.column = ''
+        self.rows = 0
+        self.accepted = 0
+        self.duplicates = 0
+        self.invalid = 0
+        self.empty = 0
+        self.invalid_samples: List[Dict[str, Any]] = []
+
+    def _detect_column(self):
+        """Pick the URL column from the header row, or treat the file as header-less"""
+        header = next(self._reader, None)
+        if header is None:
+            raise ValueError("CSV file is empty")
+        names = [name.strip().lower() for name in header]
+        
+        if self._url_column:
+            wanted = self._url_column.strip().lower()
+            if wanted not in names:
+                raise ValueError(f"Column '{self._url_column}' not found. Columns: {', '.join(header)}")
+            self._index = names.index(wanted)
+        else:
+            for candidate in CSV_URL_COLUMNS:
+                if candidate in names:
+                    self._index = names.index(candidate)
+                    break
+            else:
+                self._index = next((i for i, name in enumerate(names) if 'url' in name or 'link' in name), None)
+        
+        if self._index is None:
+            # No header row: use the first column that holds a URL
+            self._index = next((i for i, value in enumerate(header) if validate_scrape_url(value.strip())), None)
+            if self._index is None:
+                raise ValueError(
+                    f"No URL column found in CSV. Name it one of: {', '.join(CSV_URL_COLUMNS)}, "
+                    f"or pass url_column. Columns: {', '.join(header)}"
+                )
+            self.column = f"column {self._index + 1}"
+            self._leading_rows.append(header)
+        else:
+            self.column = header[self._index].strip()
+
+    def read_batch(self, size: int) -> List[str]:
+        """Return up to ``size`` new URLs; an empty list means the file is exhausted"""
+        if self._index is None:
+            self._detect_column()
+        
+        urls = []
+        while len(urls) < size:
+            if self._leading_rows:
+                row = self._leading_rows.pop()
+            else:
+                row = next(self._reader, None)
+                if row is None:
+                    break
+            self.rows += 1
+            
+            url = row[self._index].strip() if self._index < len(row) else ''
+            if not url:
+                self.empty += 1
+                continue
+            normalized = validate_scrape_url(url)
+            if normalized is None:
+                self.invalid += 1
+                if len(self.invalid_samples) < self.MAX_INVALID_SAMPLES:
+                    self.invalid_samples.append({"row": self.rows, "value": url[:200]})
+                continue
+            digest = hashlib.blake2b(normalized.encode(), digest_size=8).digest()
+            if digest in self._seen:
+                self.duplicates += 1
+                continue
+            self._seen.add(digest)
+            urls.append(url)
+        
+        self.accepted += len(urls)
+        return urls
+
+    def summary(self) -> Dict[str, Any]:
+        """Counts so far, in the shape of CSVUploadSummary"""
+        return {
+            "url_column": self.column,
+            "rows": self.rows,
+            "accepted": self.accepted,
+            "duplicates": self.duplicates,
+            "invalid": self.invalid,
+            "empty": self.empty,
+            "invalid_samples": list(self.invalid_samples),
+        }
+
+# Result listing helpers
+RESULT_FILTER_FIELDS = ("status", "stage", "focus_industry")
+RESULT_SORT = [("timestamp", -1), ("id", -1)]
+
+def result_filters(
+    status: Optional[str] = None,
+    stage: Optional[str] = None,
+    focus_industry: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """Build a scraped_data query from result filter query parameters"""
+    query: Dict[str, Any] = {}
+    for field, value in (("status", status), ("stage", stage), ("focus_industry", focus_industry)):
+        if value:
+            query[field] = value
+    if since or until:
+        query["timestamp"] = {}
+        if since:
+            query["timestamp"]["$gte"] = since
+        if until:
+            query["timestamp"]["$lt"] = until
+    return query
+
+def encode_results_cursor(result: Dict[str, Any]) -> str:
+    """Opaque cursor pointing just past ``result`` in (timestamp, id) order"""
+    position = {"t": result["timestamp"].isoformat(), "id": result["id"]}
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode().rstrip("=")
+
+def decode_results_cursor(cursor: str) -> Dict[str, Any]:
+    """Turn a cursor back into a query matching results after it"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded))
+        timestamp = datetime.fromisoformat(position["t"])
+        result_id = str(position["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return {"$or": [
+        {"timestamp": {"$lt": timestamp}},
+        {"timestamp": timestamp, "id": {"$lt": result_id}},
+    ]}
+
+# Streaming export helpers
+#
+# Exports read scraped_data through a Motor cursor in EXPORT_BATCH_SIZE batches
+# and emit one chunk per batch, so memory stays flat however many rows match.
+EXPORT_FIELDS = ['id', 'source_url', 'name', 'domain', 'website', 'email', 'contact_number', 
+                 'mobile_number', 'stage', 'focus_industry', 'focus_sector', 'service_area', 
+                 'location', 'active_years', 'engagement_level', 'active_on_portal', 
+                 'about_company', 'status', 'error_message', 'timestamp']
+
+async def iter_export_docs(query: Dict[str, Any], limit: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+    """Return an async iterator over matching results, newest first; 404 if none match"""
+    if not await db.scraped_data.find_one(query, {"_id": 1}):
+        raise HTTPException(status_code=404, detail="No results found")
     
-    # Update last used timestamp
-    await db.api_keys.update_one(
-        {"key": api_key},
-        {"$set": {"last_used": datetime.now(timezone.utc).isoformat()}}
-    )
+    find = db.scraped_data.find(query, {"_id": 0}).sort(RESULT_SORT).batch_size(EXPORT_BATCH_SIZE)
+    if limit:
+        find = find.limit(limit)
+    return find
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+async def iter_csv_chunks(docs: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+    rows = 0
+    async for doc in docs:
+        row = {k: doc.get(k, '') for k in EXPORT_FIELDS}
+        if isinstance(row['timestamp'], datetime):
+            row['timestamp'] = row['timestamp'].isoformat()
+        writer.writerow(row)
+        rows += 1
+        if rows % EXPORT_BATCH_SIZE == 0:
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate()
+    yield output.getvalue()
+
+async def iter_json_chunks(docs: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    chunk = ["["]
+    separator = "\n"
+    async for doc in docs:
+        chunk.append(separator + json.dumps(doc, indent=2, default=_json_default))
+        separator = ",\n"
+        if len(chunk) >= EXPORT_BATCH_SIZE:
+            yield "".join(chunk)
+            chunk = []
+    chunk.append("\n]\n")
+    yield "".join(chunk)
+
+async def iter_ndjson_chunks(docs: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    chunk = []
+    async for doc in docs:
+        chunk.append(json.dumps(doc, default=_json_default) + "\n")
+        if len(chunk) >= EXPORT_BATCH_SIZE:
+            yield "".join(chunk)
+            chunk = []
+    yield "".join(chunk)
+
+async def gzip_chunks(chunks: AsyncIterator[Any]) -> AsyncIterator[bytes]:
+    """Compress a stream of str/bytes chunks into one gzip member"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    async for chunk in chunks:
+        data = compressor.compress(chunk.encode() if isinstance(chunk, str) else chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+# Columnar (Parquet / Arrow IPC) exports
+ARROW_DICTIONARY_FIELDS = ('stage', 'focus_industry', 'status')
+
+def _arrow_type(field: str) -> pa.DataType:
+    if field == 'timestamp':
+        return pa.timestamp('ms', tz='UTC')
+    if field in ARROW_DICTIONARY_FIELDS:
+        return pa.dictionary(pa.int32(), pa.string())
+    return pa.string()
+
+ARROW_SCHEMA = pa.schema([(field, _arrow_type(field)) for field in EXPORT_FIELDS])
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that collects bytes until they are drained"""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+async def iter_columnar_chunks(docs: AsyncIterator[Dict[str, Any]], fmt: str) -> AsyncIterator[bytes]:
+    """Encode results as Parquet row groups or Arrow IPC stream batches.
+
+    Each ARROW_BATCH_SIZE documents become one record batch, so only one batch
+    is ever held in memory. Encoding runs in a thread (pyarrow releases the GIL).
+    """
+    sink = _ChunkSink()
+    if fmt == 'parquet':
+        writer = pq.ParquetWriter(sink, ARROW_SCHEMA, use_dictionary=list(ARROW_DICTIONARY_FIELDS), compression='snappy')
+    else:
+        writer = pa.ipc.new_stream(sink, ARROW_SCHEMA)
     
-    return key_doc
+    def write_rows(rows: List[Dict[str, Any]]):
+        writer.write_batch(pa.RecordBatch.from_pylist(rows, schema=ARROW_SCHEMA))
+    
+    try:
+        rows = []
+        async for doc in docs:
+            rows.append(doc)
+            if len(rows) >= ARROW_BATCH_SIZE:
+                await asyncio.to_thread(write_rows, rows)
+                rows = []
+                yield sink.drain()
+        if rows:
+            await asyncio.to_thread(write_rows, rows)
+    finally:
+        writer.close()
+    yield sink.drain()
+
+def export_response(request: Request, chunks: AsyncIterator[Any], media_type: str, filename: str) -> StreamingResponse:
+    """Stream an export, gzip-encoded when the client accepts it"""
+    headers = {"Content-Disposition": f"attachment; filename={filename}", "Vary": "Accept-Encoding"}
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        chunks = gzip_chunks(chunks)
+    return StreamingResponse(chunks, media_type=media_type, headers=headers)
+
+# Runtime gauges for /metrics
+job_queue_depth: Dict[str, int] = {}
+
+async def refresh_job_queue_depth():
+    """Count pending and leased job items every METRICS_QUEUE_INTERVAL seconds"""
+    while True:
+        try:
+            for status in ("pending", "leased"):
+                job_queue_depth[status] = await db.scrape_job_items.count_documents({"status": status})
+        except Exception as e:
+            logger.error(f"Error counting job items: {e}")
+        await asyncio.sleep(METRICS_QUEUE_INTERVAL)
+
+class ScraperCollector:
+    """Reads in-process state (scheduler, pools, writer, breakers) whenever /metrics is scraped"""
+
+    def collect(self):
+        def gauge(name, documentation, value):
+            return GaugeMetricFamily(name, documentation, value=value)
+        
+        yield gauge('scraper_scrapes_in_flight', 'Distinct URLs being scraped', len(inflight_scrapes))
+        yield gauge('scraper_scheduler_active', 'Scrapes holding a global concurrency slot', scrape_scheduler.active)
+        yield gauge('scraper_scheduler_waiting', 'Scrapes waiting for a global concurrency slot', scrape_scheduler.waiting)
+        yield gauge('scraper_scheduler_concurrency', 'Global concurrency slots', scrape_scheduler.concurrency)
+        
+        items = GaugeMetricFamily('scraper_job_items', 'Job items by status, refreshed periodically', labels=['status'])
+        for status, count in job_queue_depth.items():
+            items.add_metric([status], count)
+        yield items
+        yield gauge('scraper_job_leases_held', 'Job items leased by this process', len(held_leases))
+        
+        yield gauge('scraper_parse_pool_workers', 'Parser processes', PARSE_WORKERS if parse_pool is not None else 0)
+        yield gauge('scraper_parse_pool_busy', 'Pages being parsed in the process pool', parses_in_progress)
+        yield gauge('scraper_threads', 'Live threads, including the asyncio default executor', threading.active_count())
+        yield gauge('scraper_response_cache_bytes', 'Compressed size of the page cache', response_cache.size)
+        
+        writer = result_writer.stats()
+        yield gauge('scraper_result_writer_pending', 'Results buffered or being written', writer['pending'])
+        yield CounterMetricFamily('scraper_result_writer_documents', 'Results written', value=writer['documents'])
+        yield CounterMetricFamily('scraper_result_writer_errors', 'Results that failed to write', value=writer['errors'])
+        
+        breakers = circuit_breakers.snapshot()['hosts']
+        states = GaugeMetricFamily('scraper_circuit_breaker_state', 'Hosts whose breaker is not closed', labels=['host', 'state'])
+        failures = GaugeMetricFamily('scraper_circuit_breaker_failures', 'Consecutive failures per host', labels=['host'])
+        for host, breaker in breakers.items():
+            if breaker['state'] != 'closed':
+                states.add_metric([host, breaker['state']], 1)
+            failures.add_metric([host], breaker['failures'])
+        yield states
+        yield failures
+
+REGISTRY.register(ScraperCollector())
 
 # Routes
 @api_router.get("/")
@@ -311,146 +2687,310 @@ async def root():
 @api_router.post("/scrape", response_model=ScrapedData)
 async def scrape_single_url(request: ScrapeRequest):
     """Scrape a single URL"""
-    await asyncio.sleep(0.5)  # Rate limiting
-    return await scrape_url(request.url)
+    try:
+        result = await scrape_scheduler.run(request.url, request.max_age, request.crawl_limits())
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(math.ceil(e.retry_in))})
+    await result_writer.wait_persisted([result.id], flush=True)
+    return result
 
 @api_router.post("/scrape/bulk", response_model=List[ScrapedData])
 async def scrape_bulk_urls(request: BulkScrapeRequest):
-    """Scrape multiple URLs with rate limiting"""
-    results = []
-    for url in request.urls:
-        result = await scrape_url(url)
-        results.append(result)
-        await asyncio.sleep(1)  # Rate limiting between requests
+    """Scrape multiple URLs concurrently with per-host rate limiting"""
+    results = await scrape_scheduler.map(request.urls, request.crawl_limits())
+    await result_writer.wait_persisted([r.id for r in results], flush=True)
     return results
 
-@api_router.post("/scrape/upload-csv")
-async def upload_csv_for_scraping(file: UploadFile = File(...)):
-    """Upload CSV file with URLs and scrape them"""
-    if not file.filename.endswith('.csv'):
-        raise HTTPException(status_code=400, detail="Only CSV files are allowed")
+async def receive_csv_upload(request: Request) -> MultipartFile:
+    """Stream a multipart body's ``file`` part into a spooled file owned by the caller"""
+    files: List[MultipartFile] = []
+    try:
+        parser = create_form_parser(request.headers, None, files.append)
+        async for chunk in request.stream():
+            parser.write(chunk)
+        parser.finalize()
+    except (ValueError, FormParserError) as e:
+        for part in files:
+            part.close()
+        raise HTTPException(status_code=400, detail=f"Expected a multipart/form-data upload: {e}")
     
+    upload = None
+    for part in files:
+        if upload is None and part.field_name == b"file":
+            upload = part
+        else:
+            part.close()
+    if upload is None:
+        raise HTTPException(status_code=400, detail="No file uploaded in the 'file' field")
+    if not (upload.file_name or b"").decode('utf-8', 'replace').endswith('.csv'):
+        upload.close()
+        raise HTTPException(status_code=400, detail="Only CSV files are allowed")
+    upload.file_object.seek(0)
+    return upload
+
+async def ingest_csv_upload(job_id: str, reader: CSVURLReader, upload: MultipartFile):
+    """Queue the rest of an uploaded CSV's URLs, then record the reader's counts on the job"""
+    error = None
     try:
-        contents = await file.read()
-        csv_file = io.StringIO(contents.decode('utf-8'))
-        reader = csv.DictReader(csv_file)
-        
-        urls = []
-        for row in reader:
-            # Look for URL in common column names
-            url = row.get('url') or row.get('URL') or row.get('link') or row.get('Link')
-            if url:
-                urls.append(url)
-        
-        if not urls:
-            raise HTTPException(status_code=400, detail="No URLs found in CSV. Please ensure there's a column named 'url', 'URL', 'link', or 'Link'")
-        
-        # Start scraping
-        results = []
-        for url in urls:
-            result = await scrape_url(url)
-            results.append(result.model_dump())
-            await asyncio.sleep(1)  # Rate limiting
-        
-        return {"total": len(urls), "results": results}
+        while True:
+            urls = await asyncio.to_thread(reader.read_batch, JOB_ITEM_BATCH_SIZE)
+            if not urls:
+                break
+            if not await extend_scrape_job(job_id, urls, reader.accepted - len(urls)):
+                break  # Cancelled while ingesting
+    except Exception as e:
+        error = "CSV file must be UTF-8 encoded" if isinstance(e, UnicodeDecodeError) else str(e)
+        logger.error(f"Error reading CSV for job {job_id}: {error}")
+        await cancel_scrape_job(job_id)
+    finally:
+        upload.close()
+    await finish_scrape_job_ingest(job_id, {**reader.summary(), "error": error})
+
+@api_router.post(
+    "/scrape/upload-csv",
+    response_model=CSVUploadSummary,
+    openapi_extra={"requestBody": {"required": True, "content": {"multipart/form-data": {"schema": {
+        "type": "object", "required": ["file"], "properties": {"file": {"type": "string", "format": "binary"}},
+    }}}}},
+)
+async def upload_csv_for_scraping(request: Request, url_column: Optional[str] = None):
+    """Queue an uploaded CSV's URLs as a scrape job.
+
+    The job is returned as soon as the first batch of URLs is queued, still
+    ingesting; the rest of the file is queued in the background and the
+    reader's final counts are stored on the job as ``csv``.
+    """
+    upload = await receive_csv_upload(request)
+    reader = CSVURLReader(upload.file_object, url_column)
+    try:
+        urls = await asyncio.to_thread(reader.read_batch, JOB_ITEM_BATCH_SIZE)
     except Exception as e:
+        upload.close()
+        if isinstance(e, UnicodeDecodeError):
+            raise HTTPException(status_code=400, detail="CSV file must be UTF-8 encoded")
+        if isinstance(e, (ValueError, csv.Error)):
+            raise HTTPException(status_code=400, detail=str(e))
         logger.error(f"Error processing CSV: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    
+    if not urls:
+        upload.close()
+        raise HTTPException(
+            status_code=400,
+            detail=f"No valid URLs found in CSV column '{reader.column}' "
+                   f"({reader.invalid} invalid, {reader.empty} empty)"
+        )
+    
+    job = await start_scrape_job(source="csv")
+    await extend_scrape_job(job.id, urls, 0)
+    summary = reader.summary()  # Taken before the background reads move the counts on
+    task = asyncio.create_task(ingest_csv_upload(job.id, reader, upload))
+    csv_ingests.add(task)
+    task.add_done_callback(csv_ingests.discard)
+    return CSVUploadSummary(job=await get_scrape_job(job.id), **summary)
+
+# Scrape Jobs
+@api_router.post("/jobs", response_model=ScrapeJob)
+async def create_scrape_job(request: BulkScrapeRequest):
+    """Queue a background job to scrape multiple URLs"""
+    if not request.urls:
+        raise HTTPException(status_code=400, detail="No URLs provided")
+    return await submit_scrape_job(request.urls, crawl=request.crawl_limits())
+
+@api_router.get("/jobs", response_model=List[ScrapeJob])
+async def get_scrape_jobs(limit: int = 50):
+    """Get recent scrape jobs"""
+    jobs = await db.scrape_jobs.find({}, {"_id": 0}).sort("created_at", -1).limit(limit).to_list(limit)
+    return jobs
+
+@api_router.get("/jobs/{job_id}", response_model=ScrapeJob)
+async def get_scrape_job(job_id: str):
+    """Get progress of a scrape job"""
+    job = await db.scrape_jobs.find_one({"id": job_id}, {"_id": 0})
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@api_router.get("/jobs/{job_id}/results", response_model=List[ScrapedData])
+async def get_scrape_job_results(job_id: str, limit: int = 100, skip: int = 0):
+    """Get results scraped so far by a job, in CSV/request order"""
+    await get_scrape_job(job_id)
+    
+    items = await db.scrape_job_items.find(
+        {"job_id": job_id, "status": "done"}, {"_id": 0, "result_id": 1}
+    ).sort("index", 1).skip(skip).limit(limit).to_list(limit)
+    result_ids = [item['result_id'] for item in items]
+    
+    results = await db.scraped_data.find({"id": {"$in": result_ids}}, {"_id": 0}).to_list(len(result_ids))
+    by_id = {result['id']: result for result in results}
+    return [by_id[result_id] for result_id in result_ids if result_id in by_id]
+
+@api_router.get("/jobs/{job_id}/events")
+async def stream_scrape_job_events(
+    job_id: str,
+    last_event_id: Optional[str] = Header(None),
+    after: Optional[int] = None,
+):
+    """Server-Sent Events with each item's outcome and the job's counters while it runs"""
+    await get_scrape_job(job_id)
+    last_seq = after or 0
+    if last_event_id and last_event_id.isdigit():
+        last_seq = int(last_event_id)
+    return StreamingResponse(
+        iter_job_events(job_id, last_seq),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@api_router.post("/jobs/{job_id}/cancel", response_model=ScrapeJob)
+async def cancel_scrape_job(job_id: str):
+    """Cancel a queued or running scrape job; URLs already being scraped are not recorded"""
+    now = datetime.now(timezone.utc)
+    job = await db.scrape_jobs.find_one_and_update(
+        {"id": job_id, "status": {"$in": ["queued", "running"]}},
+        {"$set": {"status": "cancelled", "updated_at": now, "finished_at": now}},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER,
+    )
+    if not job:
+        return await get_scrape_job(job_id)
+    
+    await db.scrape_job_items.update_many(
+        {"job_id": job_id, "status": {"$in": ["pending", "leased"]}},
+        {"$set": {"status": "cancelled"}, "$unset": {"lease_owner": "", "lease_expires_at": ""}}
+    )
+    notify_job_listeners(job_id)
+    return job
 
 @api_router.get("/results", response_model=List[ScrapedData])
-async def get_all_results(limit: int = 100, skip: int = 0):
-    """Get all scraped results"""
-    results = await db.scraped_data.find({}, {"_id": 0}).sort("timestamp", -1).skip(skip).limit(limit).to_list(limit)
+async def get_all_results(
+    response: Response,
+    limit: int = 100,
+    skip: int = 0,
+    cursor: Optional[str] = None,
+    filters: Dict[str, Any] = Depends(result_filters),
+):
+    """Get scraped results, newest first.
+
+    Pass the X-Next-Cursor header of a page as ``cursor`` to fetch the next
+    one; ``skip`` still works but gets slower on deep pages.
+    """
+    query = filters
+    if cursor:
+        query = {"$and": [filters, decode_results_cursor(cursor)]} if filters else decode_results_cursor(cursor)
     
-    # Convert ISO string timestamps back to datetime
-    for result in results:
-        if isinstance(result.get('timestamp'), str):
-            result['timestamp'] = datetime.fromisoformat(result['timestamp'])
+    find = db.scraped_data.find(query, {"_id": 0}).sort(RESULT_SORT)
+    if not cursor and skip:
+        find = find.skip(skip)
+    results = await find.limit(limit).to_list(limit)
     
+    if limit and len(results) == limit:
+        response.headers["X-Next-Cursor"] = encode_results_cursor(results[-1])
     return results
 
 @api_router.get("/results/{result_id}", response_model=ScrapedData)
 async def get_result_by_id(result_id: str):
     """Get a specific result by ID"""
-    result = await db.scraped_data.find_one({"id": result_id}, {"_id": 0})
+    result = result_writer.get(result_id) or await db.scraped_data.find_one({"id": result_id}, {"_id": 0})
     if not result:
         raise HTTPException(status_code=404, detail="Result not found")
     
-    if isinstance(result.get('timestamp'), str):
-        result['timestamp'] = datetime.fromisoformat(result['timestamp'])
-    
     return result
 
 @api_router.get("/export/csv")
-async def export_results_csv(limit: int = 1000):
+async def export_results_csv(
+    request: Request,
+    limit: Optional[int] = None,
+    filters: Dict[str, Any] = Depends(result_filters),
+):
     """Export results to CSV"""
-    results = await db.scraped_data.find({}, {"_id": 0}).sort("timestamp", -1).limit(limit).to_list(limit)
-    
-    if not results:
-        raise HTTPException(status_code=404, detail="No results found")
-    
-    # Create CSV in memory
-    output = io.StringIO()
-    fieldnames = ['id', 'source_url', 'name', 'domain', 'website', 'email', 'contact_number', 
-                  'mobile_number', 'stage', 'focus_industry', 'focus_sector', 'service_area', 
-                  'location', 'active_years', 'engagement_level', 'active_on_portal', 
-                  'about_company', 'status', 'error_message', 'timestamp']
-    
-    writer = csv.DictWriter(output, fieldnames=fieldnames)
-    writer.writeheader()
-    
-    for result in results:
-        writer.writerow({k: result.get(k, '') for k in fieldnames})
-    
-    output.seek(0)
-    return StreamingResponse(
-        iter([output.getvalue()]),
-        media_type="text/csv",
-        headers={"Content-Disposition": "attachment; filename=scraped_data.csv"}
-    )
+    docs = await iter_export_docs(filters, limit)
+    return export_response(request, iter_csv_chunks(docs), "text/csv", "scraped_data.csv")
 
 @api_router.get("/export/json")
-async def export_results_json(limit: int = 1000):
+async def export_results_json(
+    request: Request,
+    limit: Optional[int] = None,
+    filters: Dict[str, Any] = Depends(result_filters),
+):
     """Export results to JSON"""
-    results = await db.scraped_data.find({}, {"_id": 0}).sort("timestamp", -1).limit(limit).to_list(limit)
-    
-    if not results:
-        raise HTTPException(status_code=404, detail="No results found")
-    
+    docs = await iter_export_docs(filters, limit)
+    return export_response(request, iter_json_chunks(docs), "application/json", "scraped_data.json")
+
+@api_router.get("/export/ndjson")
+async def export_results_ndjson(
+    request: Request,
+    limit: Optional[int] = None,
+    filters: Dict[str, Any] = Depends(result_filters),
+):
+    """Export results as newline-delimited JSON, one result per line"""
+    docs = await iter_export_docs(filters, limit)
+    return export_response(request, iter_ndjson_chunks(docs), "application/x-ndjson", "scraped_data.ndjson")
+
+@api_router.get("/export/parquet")
+async def export_results_parquet(
+    limit: Optional[int] = None,
+    filters: Dict[str, Any] = Depends(result_filters),
+):
+    """Export results as a Parquet file for analytics tools"""
+    docs = await iter_export_docs(filters, limit)
     return StreamingResponse(
-        iter([json.dumps(results, indent=2, default=str)]),
-        media_type="application/json",
-        headers={"Content-Disposition": "attachment; filename=scraped_data.json"}
+        iter_columnar_chunks(docs, 'parquet'),
+        media_type="application/vnd.apache.parquet",
+        headers={"Content-Disposition": "attachment; filename=scraped_data.parquet"}
     )
 
+@api_router.get("/export/arrow")
+async def export_results_arrow(
+    limit: Optional[int] = None,
+    filters: Dict[str, Any] = Depends(result_filters),
+):
+    """Export results as an Arrow IPC stream"""
+    docs = await iter_export_docs(filters, limit)
+    return StreamingResponse(
+        iter_columnar_chunks(docs, 'arrow'),
+        media_type="application/vnd.apache.arrow.stream",
+        headers={"Content-Disposition": "attachment; filename=scraped_data.arrows"}
+    )
+
+@api_router.get("/stats/breakers")
+async def get_breaker_stats():
+    """Per-host circuit breakers that are open, probing, or counting failures"""
+    return circuit_breakers.snapshot()
+
+@api_router.get("/stats/refresh")
+async def get_refresh_stats():
+    """How many refresh targets exist and how many are due now or within a day"""
+    now = datetime.now(timezone.utc)
+    return {
+        "targets": await db.scrape_targets.estimated_document_count(),
+        "due": await db.scrape_targets.count_documents({"next_check_at": {"$lte": now}}),
+        "due_within_day": await db.scrape_targets.count_documents({"next_check_at": {"$lte": now + timedelta(days=1)}}),
+    }
+
+@api_router.get("/stats/writes")
+async def get_write_stats():
+    """Batch sizes and flush latency of buffered result writes"""
+    return result_writer.stats()
+
 # API Key Management
 @api_router.post("/api-keys", response_model=APIKey)
 async def create_api_key(request: APIKeyCreate):
     """Create a new API key"""
     api_key = APIKey(
         key=f"sk_{secrets.token_urlsafe(32)}",
-        name=request.name
+        name=request.name,
+        rate_limit=request.rate_limit,
+        burst=request.burst
     )
     
-    doc = api_key.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
-    if doc.get('last_used'):
-        doc['last_used'] = doc['last_used'].isoformat()
-    
-    await db.api_keys.insert_one(doc)
+    await db.api_keys.insert_one(api_key.model_dump())
     return api_key
 
 @api_router.get("/api-keys", response_model=List[APIKey])
 async def get_api_keys():
     """Get all API keys"""
     keys = await db.api_keys.find({}, {"_id": 0}).sort("created_at", -1).to_list(100)
-    
-    for key in keys:
-        if isinstance(key.get('created_at'), str):
-            key['created_at'] = datetime.fromisoformat(key['created_at'])
-        if key.get('last_used') and isinstance(key['last_used'], str):
-            key['last_used'] = datetime.fromisoformat(key['last_used'])
-    
     return keys
 
 @api_router.delete("/api-keys/{key_id}")
@@ -458,11 +2998,12 @@ async def delete_api_key(key_id: str):
     """Deactivate an API key"""
     result = await db.api_keys.update_one(
         {"id": key_id},
-        {"$set": {"is_active": False}}
+        {"$set": {"is_active": False, "deactivated_at": datetime.now(timezone.utc)}}
     )
     
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="API key not found")
+    api_key_cache.discard_ids([key_id])
     
     return {"message": "API key deactivated"}
 
@@ -470,30 +3011,70 @@ async def delete_api_key(key_id: str):
 @api_router.post("/protected/scrape", response_model=ScrapedData)
 async def protected_scrape_single(request: ScrapeRequest, key=Depends(verify_api_key)):
     """Protected endpoint: Scrape a single URL"""
-    await asyncio.sleep(0.5)
-    return await scrape_url(request.url)
+    await enforce_rate_limit(key)
+    try:
+        result = await scrape_scheduler.run(request.url, request.max_age, request.crawl_limits())
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(math.ceil(e.retry_in))})
+    await result_writer.wait_persisted([result.id], flush=True)
+    return result
 
 @api_router.post("/protected/scrape/bulk", response_model=List[ScrapedData])
 async def protected_scrape_bulk(request: BulkScrapeRequest, key=Depends(verify_api_key)):
     """Protected endpoint: Scrape multiple URLs"""
-    results = []
-    for url in request.urls:
-        result = await scrape_url(url)
-        results.append(result)
-        await asyncio.sleep(1)
+    await enforce_rate_limit(key, cost=max(1, len(request.urls)))
+    results = await scrape_scheduler.map(request.urls, request.crawl_limits())
+    await result_writer.wait_persisted([r.id for r in results], flush=True)
     return results
 
 # Include the router in the main app
 app.include_router(api_router)
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics"""
+    return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Retry-After"],
 )
 
+@app.on_event("startup")
+async def startup_http_client():
+    get_http_session()
+    start_parse_pool()
+
+@app.on_event("startup")
+async def startup_job_workers():
+    try:
+        await ensure_indexes()
+    except Exception as e:
+        logger.error(f"Error creating indexes: {e}")
+    # Readers expect BSON dates, so legacy strings are converted before serving
+    await run_startup_migrations()
+    background_tasks.append(asyncio.create_task(result_writer.run()))
+    background_tasks.append(asyncio.create_task(api_key_usage_flusher()))
+    background_tasks.append(asyncio.create_task(api_key_revocation_watcher()))
+    background_tasks.append(asyncio.create_task(refresh_job_queue_depth()))
+    if REFRESH_POLL_INTERVAL > 0:
+        background_tasks.append(asyncio.create_task(refresh_scheduler()))
+    if JOB_WORKERS > 0:
+        background_tasks.extend(start_job_workers(JOB_WORKERS))
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    await result_writer.close()
+    await asyncio.gather(*job_completions, *csv_ingests, return_exceptions=True)
+    await flush_api_key_usage()
+    client.close()
+    if http_session is not None:
+        await http_session.close()
+    stop_parse_pool()
\ No newline at end of file
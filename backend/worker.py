@@ -0,0 +1,70 @@
+"""Standalone scrape worker.
+
+Claims queued job items from the shared Mongo database and scrapes them, so
+scraping throughput scales with the number of worker processes and API
+replicas pointed at the same database:
+
+    python worker.py --concurrency 16
+    python worker.py --drain   # exit once no claimable work is left
+    python worker.py --metrics-port 9100   # serve Prometheus metrics
+"""
+import argparse
+import asyncio
+
+from prometheus_client import start_http_server
+
+import server
+from server import logger
+
+
+async def wait_until_drained():
+    """Return once there is nothing left to claim and nothing in flight"""
+    while True:
+        await asyncio.sleep(server.JOB_POLL_INTERVAL)
+        if server.held_leases:
+            continue
+        claimable = await server.db.scrape_job_items.count_documents(
+            {"$or": [{"status": "pending"}, {"status": "leased"}]}, limit=1
+        )
+        if not claimable:
+            return
+
+
+async def main(concurrency: int, drain: bool):
+    await server.ensure_job_indexes()
+    server.start_parse_pool()
+    tasks = server.start_job_workers(concurrency)
+    tasks.append(asyncio.create_task(server.result_writer.run()))
+    logger.info(f"Scrape worker {server.WORKER_ID} started with {concurrency} slots")
+    try:
+        if drain:
+            await wait_until_drained()
+        else:
+            await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await server.result_writer.close()
+        await asyncio.gather(*server.job_completions, return_exceptions=True)
+        if server.http_session is not None:
+            await server.http_session.close()
+        server.stop_parse_pool()
+        server.client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Claim and scrape queued job items")
+    parser.add_argument("--concurrency", type=int, default=server.SCRAPE_CONCURRENCY,
+                        help="number of items scraped at once by this process")
+    parser.add_argument("--drain", action="store_true",
+                        help="exit when no pending or leased items remain")
+    parser.add_argument("--metrics-port", type=int,
+                        help="serve Prometheus metrics on this port")
+    args = parser.parse_args()
+    if args.metrics_port:
+        start_http_server(args.metrics_port)
+    try:
+        asyncio.run(main(args.concurrency, args.drain))
+    except KeyboardInterrupt:
+        pass
@@ -1,4 +1,4 @@
-import { useState, useEffect } from "react";
+import { useState, useEffect, useMemo, useRef } from "react";
 import axios from "axios";
 import { toast } from "sonner";
 import { Database, Upload, Download, Key, Loader2, Search, Moon, Sun, FileText, Table as TableIcon } from "lucide-react";
@@ -22,24 +22,49 @@ export default function Dashboard() {
   const [apiKeys, setApiKeys] = useState([]);
   const [newKeyName, setNewKeyName] = useState("");
   const [selectedFile, setSelectedFile] = useState(null);
-  const [stats, setStats] = useState({ total: 0, success: 0, failed: 0 });
+  const [jobProgress, setJobProgress] = useState(null);
+  const jobEvents = useRef(null);
   const { theme, setTheme } = useTheme();
 
+  const stats = useMemo(() => ({
+    total: results.length,
+    success: results.filter(r => r.status === "success").length,
+    failed: results.filter(r => r.status === "failed").length
+  }), [results]);
+
   useEffect(() => {
     fetchResults();
     fetchApiKeys();
+    return () => jobEvents.current?.close();
   }, []);
 
+  const watchJob = (jobId) => {
+    jobEvents.current?.close();
+    // EventSource reconnects on its own and resumes from the last event id
+    const source = new EventSource(`${API}/jobs/${jobId}/events`);
+    jobEvents.current = source;
+
+    source.addEventListener("item", (event) => {
+      const { result } = JSON.parse(event.data);
+      if (!result) return;
+      setResults(prev => [result, ...prev.filter(r => r.id !== result.id)].slice(0, 50));
+    });
+    source.addEventListener("progress", (event) => {
+      setJobProgress(JSON.parse(event.data));
+    });
+    source.addEventListener("end", (event) => {
+      const job = JSON.parse(event.data);
+      setJobProgress(job);
+      source.close();
+      jobEvents.current = null;
+      toast.success(`Job ${job.status}: ${job.succeeded} succeeded, ${job.failed} failed`);
+    });
+  };
+
   const fetchResults = async () => {
     try {
       const response = await axios.get(`${API}/results?limit=50`);
       setResults(response.data);
-      
-      // Calculate stats
-      const total = response.data.length;
-      const success = response.data.filter(r => r.status === "success").length;
-      const failed = response.data.filter(r => r.status === "failed").length;
-      setStats({ total, success, failed });
     } catch (error) {
       console.error("Error fetching results:", error);
     }
@@ -88,9 +113,13 @@ export default function Dashboard() {
       const response = await axios.post(`${API}/scrape/upload-csv`, formData, {
         headers: { "Content-Type": "multipart/form-data" }
       });
-      toast.success(`Successfully scraped ${response.data.total} URLs!`);
+      const { accepted, duplicates, invalid, job } = response.data;
+      toast.success(`Queued ${accepted} URLs for scraping` +
+        (job.ingesting ? ", reading the rest of the file" : "") +
+        (duplicates || invalid ? ` (skipped ${duplicates} duplicate, ${invalid} invalid)` : ""));
       setSelectedFile(null);
-      fetchResults();
+      setJobProgress(job);
+      watchJob(job.id);
     } catch (error) {
       toast.error("Failed to process CSV: " + (error.response?.data?.detail || error.message));
     } finally {
@@ -277,6 +306,23 @@ export default function Dashboard() {
                       <><Upload className="w-4 h-4 mr-2" /> Upload & Scrape</>
                     )}
                   </Button>
+                  {jobProgress && (
+                    <div className="space-y-2" data-testid="job-progress">
+                      <div className="flex justify-between text-sm text-muted-foreground">
+                        <span className="capitalize">{jobProgress.status}</span>
+                        <span>
+                          {jobProgress.processed} / {jobProgress.total} scraped
+                          {" "}({jobProgress.succeeded} ok, {jobProgress.failed} failed)
+                        </span>
+                      </div>
+                      <div className="h-2 w-full rounded-full bg-muted overflow-hidden">
+                        <div
+                          className="h-full bg-primary transition-all"
+                          style={{ width: `${jobProgress.total ? (100 * jobProgress.processed) / jobProgress.total : 0}%` }}
+                        />
+                      </div>
+                    </div>
+                  )}
                 </div>
               </CardContent>
             </Card>
@@ -0,0 +1,136 @@
+"""Tests for rate limiting, CSV URL reading and result cursors."""
+import asyncio
+import io
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+import server  # noqa: E402
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(server.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def acquire(limiter, key='k', rate=1.0, burst=5, cost=1):
+    return asyncio.run(limiter.acquire(key, rate, burst, cost))
+
+
+def test_token_bucket_allows_burst_then_refills(clock):
+    limiter = server.TokenBucketLimiter()
+    assert [acquire(limiter) for _ in range(5)] == [0.0] * 5
+    assert acquire(limiter) == pytest.approx(1.0)
+
+    clock[0] += 0.5
+    assert acquire(limiter) == pytest.approx(0.5)
+    clock[0] += 0.5
+    assert acquire(limiter) == 0.0
+
+
+def test_token_bucket_refused_request_spends_nothing(clock):
+    limiter = server.TokenBucketLimiter()
+    assert acquire(limiter, cost=4) == 0.0
+    assert acquire(limiter, cost=3) == pytest.approx(2.0)
+    assert acquire(limiter, cost=1) == 0.0
+
+
+def test_token_bucket_lets_oversized_request_through_into_debt(clock):
+    limiter = server.TokenBucketLimiter()
+    assert acquire(limiter, cost=8) == 0.0
+    assert acquire(limiter) == pytest.approx(4.0)
+
+    clock[0] += 4
+    assert acquire(limiter) == 0.0
+    assert acquire(limiter, cost=8) == pytest.approx(5.0)
+
+
+def test_token_bucket_keys_are_independent_and_evicted_least_recent_first(clock):
+    limiter = server.TokenBucketLimiter(max_keys=2)
+    acquire(limiter, key='a', cost=5)
+    acquire(limiter, key='b', cost=5)
+    assert acquire(limiter, key='a') > 0
+    acquire(limiter, key='c')
+
+    assert list(limiter._buckets) == ['a', 'c']
+
+
+def read_all(text, url_column=None, batch_size=100):
+    reader = server.CSVURLReader(io.BytesIO(text.encode('utf-8-sig')), url_column)
+    batches = []
+    while batch := reader.read_batch(batch_size):
+        batches.append(batch)
+    return reader, batches
+
+
+def test_csv_reader_picks_url_column_and_skips_bad_rows():
+    reader, batches = read_all(
+        'name,Website\n'
+        'Acme,https://acme.example.com\n'
+        'Blank,\n'
+        'Dup,https://ACME.example.com/\n'
+        'Bad,not a url\n'
+        'Beta,beta.example.com\n'
+    )
+
+    assert batches == [['https://acme.example.com', 'beta.example.com']]
+    assert reader.summary() == {
+        'url_column': 'Website', 'rows': 5, 'accepted': 2, 'duplicates': 1, 'invalid': 1, 'empty': 1,
+        'invalid_samples': [{'row': 4, 'value': 'not a url'}],
+    }
+
+
+def test_csv_reader_reads_in_batches():
+    rows = ''.join(f'https://example.com/{n}\n' for n in range(5))
+    reader, batches = read_all('url\n' + rows, batch_size=2)
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert reader.accepted == 5
+
+
+def test_csv_reader_without_header_uses_first_url_column():
+    reader, batches = read_all('Acme,https://acme.example.com\nBeta,https://beta.example.com\n')
+
+    assert batches == [['https://acme.example.com', 'https://beta.example.com']]
+    assert reader.column == 'column 2'
+
+
+def test_csv_reader_honours_named_column():
+    reader, batches = read_all('url,homepage\nhttps://a.example.com,https://b.example.com\n', url_column='Homepage')
+
+    assert batches == [['https://b.example.com']]
+
+
+@pytest.mark.parametrize('text, url_column, message', [
+    ('', None, 'empty'),
+    ('name,city\nAcme,Pune\n', None, 'No URL column'),
+    ('url\nhttps://a.example.com\n', 'homepage', "Column 'homepage' not found"),
+])
+def test_csv_reader_rejects_unusable_files(text, url_column, message):
+    with pytest.raises(ValueError, match=message):
+        read_all(text, url_column)
+
+
+def test_results_cursor_round_trip():
+    timestamp = datetime(2026, 1, 2, 3, 4, 5, 678000, tzinfo=timezone.utc)
+    cursor = server.encode_results_cursor({'timestamp': timestamp, 'id': 'abc'})
+
+    assert '=' not in cursor
+    assert server.decode_results_cursor(cursor) == {'$or': [
+        {'timestamp': {'$lt': timestamp}},
+        {'timestamp': timestamp, 'id': {'$lt': 'abc'}},
+    ]}
+
+
+@pytest.mark.parametrize('cursor', ['', 'not-base64!', 'e30', 'eyJ0IjogIm5vcGUiLCAiaWQiOiAxfQ'])
+def test_invalid_results_cursor_is_a_400(cursor):
+    with pytest.raises(HTTPException) as error:
+        server.decode_results_cursor(cursor)
+    assert error.value.status_code == 400
@@ -0,0 +1,146 @@
+"""Tests for per-host circuit breakers and streamed body reads."""
+import asyncio
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+import server  # noqa: E402
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(server.time, 'monotonic', clock)
+    return clock
+
+
+def test_circuit_breaker_opens_after_threshold(clock):
+    breaker = server.CircuitBreaker(threshold=3, reset_after=30)
+    for _ in range(2):
+        breaker.before_request('example.com')
+        breaker.record_failure()
+    assert breaker.state == 'closed'
+
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    clock.now += 10
+    with pytest.raises(server.CircuitOpenError) as error:
+        breaker.before_request('example.com')
+    assert error.value.retry_in == pytest.approx(20)
+    assert breaker.snapshot() == {'state': 'open', 'failures': 3, 'retry_in': 20.0}
+
+
+def test_circuit_breaker_success_resets_failures(clock):
+    breaker = server.CircuitBreaker(threshold=2, reset_after=30)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == 'closed'
+
+
+def test_half_open_breaker_lets_one_probe_through_and_closes_on_success(clock):
+    breaker = server.CircuitBreaker(threshold=1, reset_after=30)
+    breaker.record_failure()
+    clock.now += 30
+
+    breaker.before_request('example.com')
+    assert breaker.state == 'half_open'
+    with pytest.raises(server.CircuitOpenError):
+        breaker.before_request('example.com')
+
+    breaker.record_success()
+    assert breaker.state == 'closed'
+    breaker.before_request('example.com')
+
+
+def test_failed_probe_reopens_breaker(clock):
+    breaker = server.CircuitBreaker(threshold=5, reset_after=30)
+    for _ in range(5):
+        breaker.record_failure()
+    clock.now += 31
+
+    breaker.before_request('example.com')
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    with pytest.raises(server.CircuitOpenError) as error:
+        breaker.before_request('example.com')
+    assert error.value.retry_in == pytest.approx(30)
+
+
+def test_stuck_probe_is_replaced_after_reset_period(clock):
+    breaker = server.CircuitBreaker(threshold=1, reset_after=30)
+    breaker.record_failure()
+    clock.now += 30
+    breaker.before_request('example.com')
+
+    clock.now += 30
+    breaker.before_request('example.com')
+    assert breaker.state == 'half_open'
+
+
+class FakeContent:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.read = 0
+
+    async def iter_chunked(self, size):
+        for chunk in self.chunks:
+            self.read += 1
+            yield chunk
+
+
+class FakeResponse:
+    url = 'https://example.com/'
+
+    def __init__(self, *chunks):
+        self.content = FakeContent(list(chunks))
+
+
+def read_body(response, stop_at=None):
+    return asyncio.run(server.read_html_body(response, stop_at))
+
+
+FOOTER_STOP = server.StopMarker(re.compile(rb'</footer>'), (re.compile(rb'[\w.]+@[\w.]+\.com'),))
+
+
+def test_read_html_body_reads_everything_without_stop_marker():
+    assert read_body(FakeResponse(b'<html>', b'<body></body>', b'</html>')) == (b'<html><body></body></html>', False)
+
+
+def test_read_html_body_stops_after_end_marker_once_requirements_seen():
+    response = FakeResponse(b'<p>hi@acme.com</p><foo', b'ter></footer>', b'<p>rest</p>', b'<p>more</p>')
+
+    assert read_body(response, FOOTER_STOP) == (b'<p>hi@acme.com</p><footer></footer>', True)
+    assert response.content.read == 2
+
+
+def test_read_html_body_ignores_end_marker_before_requirements():
+    response = FakeResponse(b'<footer></footer>', b'<p>hi@acme.com</p>', b'<footer></footer>', b'tail')
+
+    assert read_body(response, FOOTER_STOP) == (b'<footer></footer><p>hi@acme.com</p><footer></footer>', True)
+
+
+def test_read_html_body_reads_to_the_end_when_requirement_missing():
+    body, truncated = read_body(FakeResponse(b'<footer></footer>', b'<p>no email</p>'), FOOTER_STOP)
+
+    assert (body, truncated) == (b'<footer></footer><p>no email</p>', False)
+
+
+def test_read_html_body_cuts_oversized_body_before_last_tag(monkeypatch):
+    monkeypatch.setattr(server, 'FETCH_MAX_BYTES', 16)
+
+    body, truncated = read_body(FakeResponse(b'<p>abcdef</p><p>ghijkl</p>', b'<p>never read</p>'))
+
+    assert (body, truncated) == (b'<p>abcdef</p>', True)
@@ -0,0 +1,69 @@
+"""Regression tests for startup India profile extraction.
+
+Each fixture page in fixtures/startup_india has a JSON file next to it holding
+the fields extracted by the original find_all/find_next implementation, with
+phone numbers in E.164 form.
+"""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+import server  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).parent / 'fixtures' / 'startup_india'
+FIXTURE_PAGES = sorted(FIXTURES_DIR.glob('*.html'))
+
+
+@pytest.mark.parametrize('parser', ['lxml', 'html.parser'])
+@pytest.mark.parametrize('page', FIXTURE_PAGES, ids=lambda path: path.stem)
+def test_parse_startup_india_page_matches_saved_output(page, parser, monkeypatch):
+    monkeypatch.setattr(server, 'HTML_PARSER', parser)
+    expected = json.loads(page.with_suffix('.json').read_text())
+
+    assert server.parse_startup_india_page(page.read_bytes()) == expected
+
+
+@pytest.mark.parametrize('label_text, field', [
+    ('company url', 'website'),
+    ('email address', 'email'),
+    ('mobile contact', 'mobile_number'),
+    ('contact number', 'contact_number'),
+    ('active on portal', 'active_years'),
+    ('on portal since', 'active_on_portal'),
+    ('founded', None),
+])
+def test_label_field_keyword_precedence(label_text, field):
+    assert server.label_field(label_text) == field
+
+
+@pytest.mark.parametrize('raw, expected', [
+    ('+91 9845012345', '+919845012345'),
+    ('+91-98450-12345', '+919845012345'),
+    ('09845012345', '+919845012345'),
+    ('9845098765', '+919845098765'),
+    ('040-2345-6789', '+914023456789'),
+    ('(555) 123-4567', '(555) 123-4567'),
+    ('Healthcare IT', 'Healthcare IT'),
+])
+def test_normalize_phone_number_to_e164(raw, expected):
+    assert server.normalize_phone_number(raw) == expected
+
+
+def test_extract_phone_numbers_collapses_spellings_of_one_number():
+    text = 'Call +91 9845012345 or 09845012345 or 9845012345'
+
+    assert server.extract_phone_numbers(text) == ['+919845012345']
+
+
+def test_extract_phone_numbers_ignores_longer_digit_runs():
+    assert server.extract_phone_numbers('Order 123456789012345, ref 98450123456') == []
+
+
+def test_extract_contacts_keeps_first_seen_order():
+    text = 'b@acme.in 9845098765, a@acme.in 9845012345, b@acme.in +91-9845098765'
+
+    assert server.extract_contacts(text) == (['b@acme.in', 'a@acme.in'], ['+919845098765', '+919845012345'])
@@ -0,0 +1,124 @@
+"""Tests for the write-behind result buffer, against an in-memory collection."""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+import server  # noqa: E402
+
+
+class FakeCollection:
+    """scraped_data stand-in whose insert_many runs a test-supplied coroutine"""
+
+    def __init__(self, insert):
+        self.insert = insert
+        self.calls = []
+
+    async def insert_many(self, docs, ordered=True):
+        self.calls.append([doc['id'] for doc in docs])
+        await self.insert(docs)
+
+
+class FakeDB:
+    def __init__(self, insert):
+        self.scraped_data = FakeCollection(insert)
+
+
+def docs(count):
+    return [{'id': f'r{n}', 'source_url': f'https://example.com/{n}'} for n in range(count)]
+
+
+def test_cancelled_flush_requeues_documents_and_resolves_futures_once(monkeypatch):
+    async def scenario():
+        started = asyncio.Event()
+        attempts = []
+
+        async def insert(batch):
+            attempts.append(len(batch))
+            if len(attempts) == 1:
+                started.set()
+                await asyncio.Event().wait()  # Hangs until cancelled
+
+        db = FakeDB(insert)
+        monkeypatch.setattr(server, 'db', db)
+        writer = server.ResultWriter(batch_size=100, interval=60)
+        for doc in docs(3):
+            writer.add(doc)
+        futures = [writer._pending[f'r{n}'][1] for n in range(3)]
+
+        flush = writer._start_flush()
+        await started.wait()
+        flush.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await flush
+
+        assert [doc['id'] for doc in writer._buffer] == ['r0', 'r1', 'r2']
+        assert not any(future.done() for future in futures)
+        assert writer.get('r1') is not None
+
+        await writer.flush()
+        await writer.wait_persisted(['r0', 'r1', 'r2'])
+
+        assert db.scraped_data.calls == [['r0', 'r1', 'r2'], ['r0', 'r1', 'r2']]
+        assert all(future.done() and future.exception() is None for future in futures)
+        assert writer.stats()['documents'] == 3
+        assert writer.stats()['flushes'] == 1
+        assert writer.stats()['pending'] == 0
+
+    asyncio.run(scenario())
+
+
+def test_duplicate_keys_count_as_written_and_other_errors_fail(monkeypatch):
+    async def scenario():
+        async def insert(batch):
+            raise BulkWriteError({'writeErrors': [
+                {'index': 0, 'code': 11000, 'errmsg': 'duplicate key'},
+                {'index': 1, 'code': 121, 'errmsg': 'document failed validation'},
+            ]})
+
+        monkeypatch.setattr(server, 'db', FakeDB(insert))
+        writer = server.ResultWriter(batch_size=100, interval=60)
+        for doc in docs(3):
+            writer.add(doc)
+        futures = {f'r{n}': writer._pending[f'r{n}'][1] for n in range(3)}
+
+        await writer.flush()
+
+        assert futures['r0'].exception() is None
+        assert 'failed validation' in str(futures['r1'].exception())
+        assert futures['r2'].exception() is None
+        assert writer.stats()['documents'] == 2
+        assert writer.stats()['errors'] == 1
+        with pytest.raises(Exception, match='failed validation'):
+            await asyncio.shield(futures['r1'])
+
+    asyncio.run(scenario())
+
+
+def test_full_batch_starts_a_flush(monkeypatch):
+    async def scenario():
+        async def insert(batch):
+            pass
+
+        db = FakeDB(insert)
+        monkeypatch.setattr(server, 'db', db)
+        writer = server.ResultWriter(batch_size=2, interval=60)
+        first, second, third = docs(3)
+        writer.add(first)
+        assert writer._flush_tasks == set()
+        writer.add(second)
+        await writer.wait_persisted(['r0', 'r1'])
+        writer.add(third)
+
+        assert db.scraped_data.calls == [['r0', 'r1']]
+        assert writer.get('r0') is None
+        assert writer.get('r2') is not None
+
+        await writer.close()
+        assert db.scraped_data.calls == [['r0', 'r1'], ['r2']]
+
+    asyncio.run(scenario())